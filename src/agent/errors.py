@@ -1,8 +1,9 @@
 """Error handling and recovery strategies."""
 
+import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Callable
 
 from src.app.config import config
 
@@ -19,7 +20,7 @@ class RecoveryStrategy(Enum):
     GIVE_UP = "give_up"  # Stop trying
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorContext:
     """Context for error recovery decisions."""
 
@@ -31,7 +32,7 @@ class ErrorContext:
     recent_failures: list[dict[str, Any]]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RecoveryAction:
     """A recovery action to attempt."""
 
@@ -41,126 +42,175 @@ class RecoveryAction:
     tool_args: dict[str, Any] | None = None
 
 
+# Recovery actions are immutable, so common ones are shared module-level instances
+_DEFAULT_RETRY = RecoveryAction(
+    strategy=RecoveryStrategy.WAIT,
+    description="Wait and retry",
+    tool_name="wait",
+    tool_args={"seconds": 2.0},
+)
+
+# Recovery actions by retry count for element not found errors
+_NOT_FOUND_ACTIONS = (
+    # First try: wait for dynamic content
+    RecoveryAction(
+        strategy=RecoveryStrategy.WAIT,
+        description="Wait for element to appear",
+        tool_name="wait",
+        tool_args={"seconds": 2.0},
+    ),
+    # Second try: scroll to find element
+    RecoveryAction(
+        strategy=RecoveryStrategy.SCROLL,
+        description="Scroll down to find element",
+        tool_name="scroll",
+        tool_args={"amount": 500},
+    ),
+    # Third try: scroll up
+    RecoveryAction(
+        strategy=RecoveryStrategy.SCROLL,
+        description="Scroll up to find element",
+        tool_name="scroll",
+        tool_args={"amount": -500},
+    ),
+)
+
+_NOT_FOUND_ALTERNATIVE = RecoveryAction(
+    strategy=RecoveryStrategy.ALTERNATIVE,
+    description="Element not found - try query_dom with different query",
+)
+
+# Recovery actions by retry count for element obscured/intercepted errors
+_OBSCURED_ACTIONS = (
+    # First: try closing popups
+    RecoveryAction(
+        strategy=RecoveryStrategy.CLOSE_POPUP,
+        description="Close popups that may be blocking",
+        tool_name="close_popups",
+        tool_args={},
+    ),
+    # Scroll element into better view
+    RecoveryAction(
+        strategy=RecoveryStrategy.SCROLL,
+        description="Scroll to better position element",
+        tool_name="scroll",
+        tool_args={"amount": -200},
+    ),
+    # Wait for animations
+    RecoveryAction(
+        strategy=RecoveryStrategy.WAIT,
+        description="Wait for animations/overlays",
+        tool_name="wait",
+        tool_args={"seconds": 1.5},
+    ),
+)
+
+_OBSCURED_ALTERNATIVE = RecoveryAction(
+    strategy=RecoveryStrategy.ALTERNATIVE,
+    description="Element obscured - try alternative selector",
+)
+
+_NAVIGATION_RETRY = RecoveryAction(
+    strategy=RecoveryStrategy.WAIT,
+    description="Wait and retry navigation",
+    tool_name="wait",
+    tool_args={"seconds": 3.0},
+)
+
+_NAVIGATION_GIVE_UP = RecoveryAction(
+    strategy=RecoveryStrategy.GIVE_UP,
+    description="Navigation failed - network issue",
+)
+
+# Error keywords by category, in priority order (first category wins)
+ERROR_KEYWORDS: dict[str, tuple[str, ...]] = {
+    # Element not found errors
+    "not_found": ("not found", "no element", "timeout", "waiting for selector"),
+    # Element not visible/clickable
+    "obscured": ("not visible", "intercepted", "obscured", "covered"),
+    # Navigation errors
+    "nav": ("navigation", "net::", "err_"),
+}
+
+_ERROR_PRIORITY = {category: i for i, category in enumerate(ERROR_KEYWORDS)}
+
+# Single case-insensitive alternation with one named group per category, so an
+# error message is classified in one linear scan without a lowercased copy.
+_ERROR_RE = re.compile(
+    "|".join(
+        f"(?P<{category}>{'|'.join(re.escape(kw) for kw in keywords)})"
+        for category, keywords in ERROR_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+
+def classify_error(error_message: str) -> str | None:
+    """Return the highest-priority error category found in an error message."""
+    best: str | None = None
+    for match in _ERROR_RE.finditer(error_message):
+        # Every alternative sits in a named group, so lastgroup is always set
+        category = match.lastgroup or ""
+        if best is None or _ERROR_PRIORITY[category] < _ERROR_PRIORITY[best]:
+            best = category
+            if _ERROR_PRIORITY[best] == 0:
+                break
+    return best
+
+
 class ErrorHandler:
     """Handles errors and determines recovery strategies."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._retry_counts: dict[str, int] = {}
+        self._handlers: dict[str, Callable[[int], RecoveryAction]] = {
+            "not_found": self._handle_element_not_found,
+            "obscured": self._handle_element_obscured,
+            "nav": self._handle_navigation_error,
+        }
 
     def get_recovery_strategy(self, context: ErrorContext) -> RecoveryAction:
         """Determine the best recovery strategy for an error."""
-        error_lower = context.error_message.lower()
-
-        # Element not found errors
-        not_found_keywords = ["not found", "no element", "timeout", "waiting for selector"]
-        if any(kw in error_lower for kw in not_found_keywords):
-            return self._handle_element_not_found(context)
+        return self.recovery_for(context.error_message, context.retry_count)
 
-        # Element not visible/clickable
-        if any(kw in error_lower for kw in ["not visible", "intercepted", "obscured", "covered"]):
-            return self._handle_element_obscured(context)
-
-        # Navigation errors
-        if any(kw in error_lower for kw in ["navigation", "net::", "err_"]):
-            return self._handle_navigation_error(context)
+    def recovery_for(self, error_message: str, retry_count: int) -> RecoveryAction:
+        """Determine the recovery strategy from the only two inputs it depends on."""
+        # Empty messages (e.g. bare exceptions) can't match any category
+        if error_message:
+            category = classify_error(error_message)
+            if category is not None:
+                return self._handlers[category](retry_count)
 
         # Default: retry with wait
-        if context.retry_count < config.MAX_RETRIES:
-            return RecoveryAction(
-                strategy=RecoveryStrategy.WAIT,
-                description="Wait and retry",
-                tool_name="wait",
-                tool_args={"seconds": 2.0},
-            )
+        if retry_count < config.MAX_RETRIES:
+            return _DEFAULT_RETRY
 
         return RecoveryAction(
             strategy=RecoveryStrategy.GIVE_UP,
-            description=f"Failed after {context.retry_count} attempts: {context.error_message}",
+            description=f"Failed after {retry_count} attempts: {error_message}",
         )
 
-    def _handle_element_not_found(self, context: ErrorContext) -> RecoveryAction:
+    def _handle_element_not_found(self, retry_count: int) -> RecoveryAction:
         """Handle element not found errors."""
-        if context.retry_count == 0:
-            # First try: wait for dynamic content
-            return RecoveryAction(
-                strategy=RecoveryStrategy.WAIT,
-                description="Wait for element to appear",
-                tool_name="wait",
-                tool_args={"seconds": 2.0},
-            )
-
-        if context.retry_count == 1:
-            # Second try: scroll to find element
-            return RecoveryAction(
-                strategy=RecoveryStrategy.SCROLL,
-                description="Scroll down to find element",
-                tool_name="scroll",
-                tool_args={"amount": 500},
-            )
-
-        if context.retry_count == 2:
-            # Third try: scroll up
-            return RecoveryAction(
-                strategy=RecoveryStrategy.SCROLL,
-                description="Scroll up to find element",
-                tool_name="scroll",
-                tool_args={"amount": -500},
-            )
+        if retry_count < len(_NOT_FOUND_ACTIONS):
+            return _NOT_FOUND_ACTIONS[retry_count]
 
         # Give up and suggest alternative
-        return RecoveryAction(
-            strategy=RecoveryStrategy.ALTERNATIVE,
-            description="Element not found - try query_dom with different query",
-        )
+        return _NOT_FOUND_ALTERNATIVE
 
-    def _handle_element_obscured(self, context: ErrorContext) -> RecoveryAction:
+    def _handle_element_obscured(self, retry_count: int) -> RecoveryAction:
         """Handle element obscured/intercepted errors."""
-        if context.retry_count == 0:
-            # First: try closing popups
-            return RecoveryAction(
-                strategy=RecoveryStrategy.CLOSE_POPUP,
-                description="Close popups that may be blocking",
-                tool_name="close_popups",
-                tool_args={},
-            )
-
-        if context.retry_count == 1:
-            # Scroll element into better view
-            return RecoveryAction(
-                strategy=RecoveryStrategy.SCROLL,
-                description="Scroll to better position element",
-                tool_name="scroll",
-                tool_args={"amount": -200},
-            )
-
-        if context.retry_count == 2:
-            # Wait for animations
-            return RecoveryAction(
-                strategy=RecoveryStrategy.WAIT,
-                description="Wait for animations/overlays",
-                tool_name="wait",
-                tool_args={"seconds": 1.5},
-            )
+        if retry_count < len(_OBSCURED_ACTIONS):
+            return _OBSCURED_ACTIONS[retry_count]
 
-        return RecoveryAction(
-            strategy=RecoveryStrategy.ALTERNATIVE,
-            description="Element obscured - try alternative selector",
-        )
+        return _OBSCURED_ALTERNATIVE
 
-    def _handle_navigation_error(self, context: ErrorContext) -> RecoveryAction:
+    def _handle_navigation_error(self, retry_count: int) -> RecoveryAction:
         """Handle navigation/network errors."""
-        if context.retry_count < 2:
-            return RecoveryAction(
-                strategy=RecoveryStrategy.WAIT,
-                description="Wait and retry navigation",
-                tool_name="wait",
-                tool_args={"seconds": 3.0},
-            )
+        if retry_count < 2:
+            return _NAVIGATION_RETRY
 
-        return RecoveryAction(
-            strategy=RecoveryStrategy.GIVE_UP,
-            description="Navigation failed - network issue",
-        )
+        return _NAVIGATION_GIVE_UP
 
     def track_action(self, action_key: str, success: bool) -> int:
         """Track action attempts and return retry count."""
@@ -175,16 +225,28 @@ class ErrorHandler:
         """Reset all retry counters."""
         self._retry_counts.clear()
 
+    # Tools keyed on their main argument: tool name -> (key prefix, argument)
+    _KEY_FIELDS: dict[str, tuple[str, str]] = {
+        "click": ("click", "selector"),
+        "type_text": ("type", "selector"),
+        "navigate_to_url": ("nav", "url"),
+    }
+
     def get_action_key(self, tool_name: str, tool_args: dict[str, Any]) -> str:
         """Generate a unique key for an action."""
         # Use tool name + main argument
-        if tool_name == "click":
-            return f"click:{tool_args.get('selector', '')}"
-        if tool_name == "type_text":
-            return f"type:{tool_args.get('selector', '')}"
-        if tool_name == "navigate_to_url":
-            return f"nav:{tool_args.get('url', '')}"
-        return f"{tool_name}:{hash(str(tool_args))}"
+        key_field = self._KEY_FIELDS.get(tool_name)
+        if key_field is not None:
+            prefix, arg = key_field
+            return f"{prefix}:{tool_args.get(arg, '')}"
+
+        # Argument names are unique, so sorting never compares values
+        items = tuple(sorted(tool_args.items()))
+        try:
+            return f"{tool_name}:{hash(items)}"
+        except TypeError:
+            # Unhashable values (lists, dicts) fall back to their repr
+            return f"{tool_name}:{hash(tuple((k, repr(v)) for k, v in items))}"
 
 
 # Global error handler instance
@@ -1,13 +1,15 @@
 """Memory management for agent context."""
 
+from collections import deque
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 from src.app.config import config
 from src.utils.text import compress_history
 
 
-@dataclass
+@dataclass(slots=True)
 class Step:
     """A single step in agent history."""
 
@@ -20,7 +22,7 @@ class Step:
     observation_summary: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMemory:
     """Manages agent memory with context compression."""
 
@@ -29,6 +31,19 @@ class AgentMemory:
     state_summary: str = ""
     total_tokens_used: int = 0
 
+    # Running counters so the state summary is O(1) per step
+    _action_counts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _success_count: int = field(default=0, init=False, repr=False)
+
+    # Most recent failed steps, for error recovery
+    _recent_failures: deque[Step] = field(
+        default_factory=lambda: deque(maxlen=16), init=False, repr=False
+    )
+
+    # History summary cache, keyed on the number of steps it was built from
+    _history_cache_key: int = field(default=-1, init=False, repr=False)
+    _history_cache: str = field(default="", init=False, repr=False)
+
     def add_step(
         self,
         tool_name: str,
@@ -38,9 +53,18 @@ class AgentMemory:
         observation_summary: str = "",
     ) -> None:
         """Add a new step to history."""
+        try:
+            # Key on each value's type too: 1, 1.0 and True hash and compare
+            # equal but format differently
+            arg_items = tuple((k, type(v), v) for k, v in tool_args.items())
+            action = _format_action(tool_name, arg_items)
+        except TypeError:
+            # Unhashable argument values can't be cached
+            action = f"{tool_name}({self._format_args(tool_args)})"
+
         step = Step(
             step_number=len(self.steps) + 1,
-            action=f"{tool_name}({self._format_args(tool_args)})",
+            action=action,
             tool_name=tool_name,
             tool_args=tool_args,
             result_summary=result_summary,
@@ -48,6 +72,11 @@ class AgentMemory:
             observation_summary=observation_summary,
         )
         self.steps.append(step)
+        self._action_counts[tool_name] = self._action_counts.get(tool_name, 0) + 1
+        if success:
+            self._success_count += 1
+        else:
+            self._recent_failures.append(step)
 
         # Update state summary
         self._update_state_summary()
@@ -57,6 +86,10 @@ class AgentMemory:
         if not self.steps:
             return "No previous actions."
 
+        # Steps are append-only, so the summary only changes when one is added
+        if self._history_cache_key == len(self.steps):
+            return self._history_cache
+
         # Convert steps to dict format for compression
         step_dicts = [
             {
@@ -67,12 +100,13 @@ class AgentMemory:
             for s in self.steps
         ]
 
-        return compress_history(step_dicts, max_steps=config.MAX_HISTORY_STEPS)
+        self._history_cache = compress_history(step_dicts, max_steps=config.MAX_HISTORY_STEPS)
+        self._history_cache_key = len(self.steps)
+        return self._history_cache
 
     def get_recent_failures(self, n: int = 3) -> list[Step]:
-        """Get recent failed steps for error recovery."""
-        failures = [s for s in self.steps if not s.success]
-        return failures[-n:]
+        """Get recent failed steps for error recovery (at most the last 16)."""
+        return list(self._recent_failures)[-n:]
 
     def get_last_step(self) -> Step | None:
         """Get the most recent step."""
@@ -93,16 +127,8 @@ class AgentMemory:
         # Track important state changes
         summaries = []
 
-        # Count actions by type
-        action_counts: dict[str, int] = {}
-        for step in self.steps:
-            action_counts[step.tool_name] = action_counts.get(step.tool_name, 0) + 1
-
         # Success rate
-        success_count = sum(1 for s in self.steps if s.success)
-        total = len(self.steps)
-
-        summaries.append(f"Steps: {total} ({success_count} successful)")
+        summaries.append(f"Steps: {len(self.steps)} ({self._success_count} successful)")
 
         # Last action
         summaries.append(f"Last: {last_step.action} -> {last_step.result_summary}")
@@ -113,17 +139,25 @@ class AgentMemory:
 
         self.state_summary = " | ".join(summaries)
 
-    def _format_args(self, args: dict[str, Any], max_len: int = 50) -> str:
+    @staticmethod
+    def _format_args(args: dict[str, Any], max_len: int = 50) -> str:
         """Format arguments compactly."""
         parts = []
+        length = 0
         for k, v in args.items():
             v_str = str(v)
             if len(v_str) > 30:
                 v_str = v_str[:27] + "..."
-            parts.append(f"{k}={v_str}")
+            part = f"{k}={v_str}"
+            parts.append(part)
+
+            # Stop once the budget is spent; later args would be cut anyway
+            length += len(part) + (2 if length else 0)
+            if length > max_len:
+                break
 
         result = ", ".join(parts)
-        if len(result) > max_len:
+        if length > max_len:
             result = result[: max_len - 3] + "..."
         return result
 
@@ -132,3 +166,10 @@ class AgentMemory:
         # This is handled by the orchestrator which maintains
         # the full conversation. Memory just tracks our state.
         return []
+
+
+@lru_cache(maxsize=256)
+def _format_action(tool_name: str, arg_items: tuple[tuple[str, type, Any], ...]) -> str:
+    """Format an action string, shared across repeated identical actions."""
+    args = {k: v for k, _, v in arg_items}
+    return f"{tool_name}({AgentMemory._format_args(args)})"
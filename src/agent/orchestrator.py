@@ -1,13 +1,15 @@
 """Main agent orchestrator with plan/act/observe loop."""
 
 import asyncio
+import re
+import reprlib
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
-from src.agent.errors import ErrorContext, ErrorHandler, RecoveryStrategy
+from src.agent.errors import ErrorHandler, RecoveryStrategy
 from src.agent.memory import AgentMemory
-from src.agent.policies import security_policy
+from src.agent.policies import READ_ONLY_TOOLS, security_policy
 from src.agent.prompts import SYSTEM_PROMPT, create_task_prompt
 from src.agent.subagents.dom_analyst import DOMAnalyst
 from src.app.config import config
@@ -15,7 +17,7 @@ from src.app.i18n import t
 from src.app.logging import RunLogger, get_user_confirmation
 from src.browser.controller import BrowserController
 from src.browser.observation import Observer
-from src.llm.base import LLMProvider, LLMResponse
+from src.llm.base import LLMProvider, LLMResponse, ToolCall
 from src.tools.registry import registry
 
 
@@ -29,7 +31,56 @@ class AgentStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Completion signals in LLM text, in priority order, with the i18n key
+# used to announce them
+COMPLETION_SIGNALS: dict[str, tuple[AgentStatus, str]] = {
+    "DONE": (AgentStatus.DONE, "task_complete"),
+    "NEED_USER_INPUT": (AgentStatus.NEED_USER_INPUT, "needs_user_input"),
+    "FAILED": (AgentStatus.FAILED, "task_failed"),
+}
+
+# Tools that can change the page URL
+NAVIGATION_TOOLS = frozenset({"navigate_to_url", "click", "press", "back"})
+
+# Bounded repr for step result summaries, so large tool results are never
+# fully stringified just to keep their first 100 characters
+_RESULT_REPR = reprlib.Repr()
+_RESULT_REPR.maxstring = 100
+_RESULT_REPR.maxother = 100
+_RESULT_REPR.maxdict = 4
+_RESULT_REPR.maxlist = 4
+
+_SIGNAL_PRIORITY = {name: i for i, name in enumerate(COMPLETION_SIGNALS)}
+_SIGNAL_RE = re.compile(r"(DONE|NEED_USER_INPUT|FAILED):", re.IGNORECASE)
+
+
+def find_completion_signal(content: str) -> tuple[str, str] | None:
+    """Find the highest-priority completion signal and the text following it."""
+    # Fast path: the model almost always leads with the signal
+    stripped = content.lstrip()
+    head = stripped[:24].upper()
+    for name in COMPLETION_SIGNALS:
+        if head.startswith(name) and head[len(name):len(name) + 1] == ":":
+            return name, stripped[len(name) + 1:].strip()
+
+    best: re.Match[str] | None = None
+    for match in _SIGNAL_RE.finditer(content):
+        name = match.group(1).upper()
+        if best is None or _SIGNAL_PRIORITY[name] < _SIGNAL_PRIORITY[best.group(1).upper()]:
+            best = match
+    if best is None:
+        return None
+    return best.group(1).upper(), content[best.end():].strip()
+
+
+def summarize_result(result: Any, max_length: int = 100) -> str:
+    """Summarize a tool result for memory without stringifying all of it."""
+    if isinstance(result, str):
+        return result[:max_length]
+    return _RESULT_REPR.repr(result)[:max_length]
+
+
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of agent execution."""
 
@@ -69,6 +120,7 @@ class Orchestrator:
         self.memory: AgentMemory | None = None
         self.messages: list[dict[str, Any]] = []
         self._should_stop = False
+        self._current_url = ""
 
     async def execute_task(self, task: str) -> ExecutionResult:
         """
@@ -83,6 +135,7 @@ class Orchestrator:
         self.memory = AgentMemory(task=task)
         self.messages = []
         self._should_stop = False
+        self._current_url = self.browser.get_url()
         self.error_handler.reset()
 
         self.logger.log_agent_thought(t("starting_task", task=task))
@@ -97,6 +150,7 @@ class Orchestrator:
                 self.logger.log_orchestrator(t("orch_step", step=step_count))
                 self.logger.log_orchestrator(t("orch_observing"))
                 observation = await self.observer.observe()
+                self._current_url = observation.url
                 observation_text = observation.to_prompt_text()
 
                 # 2. Get history summary (context compression)
@@ -124,7 +178,7 @@ class Orchestrator:
                         status=AgentStatus.FAILED,
                         summary="LLM did not respond",
                         steps_taken=step_count,
-                        final_url=await self.browser.get_url(),
+                        final_url=self._current_url,
                     )
 
                 # 5. Process response
@@ -151,7 +205,7 @@ class Orchestrator:
                         status=AgentStatus.FAILED,
                         summary=f"Error: {e}",
                         steps_taken=step_count,
-                        final_url=await self.browser.get_url(),
+                        final_url=self._current_url,
                     )
 
         # Max steps reached
@@ -159,16 +213,14 @@ class Orchestrator:
             status=AgentStatus.FAILED,
             summary=f"Max steps ({config.MAX_STEPS}) reached without completion",
             steps_taken=step_count,
-            final_url=await self.browser.get_url(),
+            final_url=self._current_url,
         )
 
     async def _get_llm_response(self) -> LLMResponse | None:
         """Get response from LLM."""
-        tools = registry.get_all_definitions()
-
         response = await self.llm.chat(
             messages=self.messages,
-            tools=tools,
+            tools=registry.get_all_definitions(),
             system_prompt=SYSTEM_PROMPT,
         )
 
@@ -194,36 +246,17 @@ class Orchestrator:
         """
         # Check for completion signals in text
         if response.content:
-            content_upper = response.content.upper()
-
-            if "DONE:" in content_upper:
-                summary = response.content.split("DONE:", 1)[-1].strip()
-                self.logger.log_agent_thought(t("task_complete", summary=summary))
-                return ExecutionResult(
-                    status=AgentStatus.DONE,
-                    summary=summary,
-                    steps_taken=len(self.memory.steps) if self.memory else 0,
-                    final_url=await self.browser.get_url(),
-                )
-
-            if "NEED_USER_INPUT:" in content_upper:
-                reason = response.content.split("NEED_USER_INPUT:", 1)[-1].strip()
-                self.logger.log_agent_thought(t("needs_user_input", reason=reason))
-                return ExecutionResult(
-                    status=AgentStatus.NEED_USER_INPUT,
-                    summary=reason,
-                    steps_taken=len(self.memory.steps) if self.memory else 0,
-                    final_url=await self.browser.get_url(),
-                )
+            signal = find_completion_signal(response.content)
 
-            if "FAILED:" in content_upper:
-                reason = response.content.split("FAILED:", 1)[-1].strip()
-                self.logger.log_agent_thought(t("task_failed", reason=reason))
+            if signal:
+                name, text = signal
+                status, message_key = COMPLETION_SIGNALS[name]
+                self.logger.log_agent_thought(t(message_key, summary=text, reason=text))
                 return ExecutionResult(
-                    status=AgentStatus.FAILED,
-                    summary=reason,
+                    status=status,
+                    summary=text,
                     steps_taken=len(self.memory.steps) if self.memory else 0,
-                    final_url=await self.browser.get_url(),
+                    final_url=self._current_url,
                 )
 
             # Log thought if present
@@ -234,22 +267,21 @@ class Orchestrator:
         if response.tool_calls:
             tool_results = []
 
-            for tc in response.tool_calls:
-                result = await self._execute_tool(
-                    tc.id,
-                    tc.name,
-                    tc.arguments,
-                    current_url,
-                )
-                tool_results.append(result)
+            for batch in self._batch_tool_calls(response.tool_calls):
+                # Calls within a batch are read-only and can run concurrently
+                results = await asyncio.gather(*(
+                    self._execute_tool(tc.id, tc.name, tc.arguments, current_url)
+                    for tc in batch
+                ))
+                tool_results.extend(results)
 
                 # Check if security blocked
-                if result.get("blocked"):
+                if any(result.get("blocked") for result in results):
                     return ExecutionResult(
                         status=AgentStatus.CANCELLED,
                         summary="User cancelled action",
                         steps_taken=len(self.memory.steps) if self.memory else 0,
-                        final_url=await self.browser.get_url(),
+                        final_url=self._current_url,
                     )
 
             # Add tool results to messages using provider-specific format
@@ -258,6 +290,25 @@ class Orchestrator:
 
         return None  # Continue execution
 
+    def _batch_tool_calls(self, tool_calls: list[ToolCall]) -> list[list[ToolCall]]:
+        """
+        Group tool calls into batches that preserve call order.
+
+        Consecutive read-only calls share a batch; every other call gets a
+        batch of its own so page-changing actions still run one at a time.
+        """
+        batches: list[list[ToolCall]] = []
+        for tc in tool_calls:
+            if (
+                tc.name in READ_ONLY_TOOLS
+                and batches
+                and batches[-1][-1].name in READ_ONLY_TOOLS
+            ):
+                batches[-1].append(tc)
+            else:
+                batches.append([tc])
+        return batches
+
     async def _execute_tool(
         self,
         tool_id: str,
@@ -267,12 +318,10 @@ class Orchestrator:
     ) -> dict[str, Any]:
         """Execute a single tool with security checks and error handling."""
         # Security check
-        page_text = await self.browser.get_visible_text(max_length=500)
         classification = self.security.classify_action(
             tool_name,
             tool_args,
             current_url,
-            page_text,
         )
 
         if classification.requires_confirmation:
@@ -281,7 +330,7 @@ class Orchestrator:
                 classification.reason,
             )
 
-            if not get_user_confirmation(t("confirm_prompt")):
+            if not await get_user_confirmation(t("confirm_prompt")):
                 self.logger.log_agent_thought(t("action_cancelled"))
                 return self.llm.format_tool_result(
                     tool_id,
@@ -305,15 +354,18 @@ class Orchestrator:
             # Log success
             self.logger.log_tool_call(tool_name, tool_args, result, success=True)
 
+            # Only navigation-capable tools can move the page elsewhere
+            if tool_name in NAVIGATION_TOOLS:
+                self._current_url = self.browser.get_url()
+
             # Update memory
             if self.memory:
-                observation = await self.observer.observe(take_screenshot=False)
                 self.memory.add_step(
                     tool_name,
                     tool_args,
-                    str(result)[:100],
+                    summarize_result(result),
                     success=True,
-                    observation_summary=observation.url,
+                    observation_summary=self._current_url,
                 )
 
             self.error_handler.track_action(action_key, success=True)
@@ -331,16 +383,7 @@ class Orchestrator:
             )
 
             # Get recovery strategy
-            context = ErrorContext(
-                error_type=type(e).__name__,
-                error_message=error_msg,
-                tool_name=tool_name,
-                tool_args=tool_args,
-                retry_count=retry_count,
-                recent_failures=[],
-            )
-
-            recovery = self.error_handler.get_recovery_strategy(context)
+            recovery = self.error_handler.recovery_for(error_msg, retry_count)
 
             if recovery.strategy != RecoveryStrategy.GIVE_UP and recovery.tool_name:
                 # Execute recovery action
@@ -1,8 +1,10 @@
 """Security policies for action classification and confirmation."""
 
+import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 
 class ActionRisk(Enum):
@@ -13,7 +15,7 @@ class ActionRisk(Enum):
     DESTRUCTIVE = "destructive"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ActionClassification:
     """Classification result for an action."""
 
@@ -47,6 +49,14 @@ SENSITIVE_INPUT_KEYWORDS = {
     "ssn", "social security",
 }
 
+# Tools that only read page state and never change it
+READ_ONLY_TOOLS = frozenset({
+    "query_dom",
+    "get_all_elements",
+    "get_current_url",
+    "take_screenshot",
+})
+
 # URL patterns for payment pages
 PAYMENT_URL_PATTERNS = [
     "checkout", "payment", "pay", "order",
@@ -54,155 +64,201 @@ PAYMENT_URL_PATTERNS = [
 ]
 
 
+def _compile_keywords(keywords: set[str] | list[str]) -> re.Pattern[str]:
+    """Compile keywords into one alternation, longest first so phrases win."""
+    ordered = sorted(keywords, key=lambda kw: (-len(kw), kw))
+    return re.compile("|".join(re.escape(kw) for kw in ordered))
+
+
+# Keyword sets compiled once, so each check is a single scan of the input.
+# Matching stays substring-based: selectors such as "#checkoutBtn" or
+# "button.placeOrder" carry keywords without word boundaries around them.
+_DESTRUCTIVE_RE = _compile_keywords(DESTRUCTIVE_KEYWORDS)
+_SENSITIVE_INPUT_RE = _compile_keywords(SENSITIVE_INPUT_KEYWORDS)
+_PAYMENT_URL_RE = _compile_keywords(PAYMENT_URL_PATTERNS)
+
+
+def _is_payment_url(page_url: str) -> bool:
+    """Check a lowercased URL for payment-page patterns in one scan."""
+    return _PAYMENT_URL_RE.search(page_url) is not None
+
+
+# Matches text containing at least 13 digits, stopping at the 13th
+_CARD_DIGITS_RE = re.compile(r"(?:\D*\d){13}")
+
+# Keywords that are risky to click only on payment pages
+PAYMENT_RISKY_KEYWORDS = {"submit", "confirm", "order"}
+
+# Click selectors are scanned once for both sets. Destructive keywords come
+# first so they win at any given position; payment-only hits land in the
+# "risky" group.
+_CLICK_RE = re.compile(
+    f"{_DESTRUCTIVE_RE.pattern}"
+    f"|(?P<risky>{_compile_keywords(PAYMENT_RISKY_KEYWORDS - DESTRUCTIVE_KEYWORDS).pattern})"
+)
+
+
+# Fixed verdicts are immutable, so they are shared instead of rebuilt per call
+_SAFE_NAVIGATION = ActionClassification(
+    risk=ActionRisk.SAFE,
+    reason="Read-only or navigation action",
+    requires_confirmation=False,
+)
+_SAFE_NON_MODIFYING = ActionClassification(
+    risk=ActionRisk.SAFE,
+    reason="Non-modifying action",
+    requires_confirmation=False,
+)
+_SAFE_CLICK = ActionClassification(
+    risk=ActionRisk.SAFE,
+    reason="Regular click action",
+    requires_confirmation=False,
+)
+_SAFE_TYPE = ActionClassification(
+    risk=ActionRisk.SAFE,
+    reason="Regular text input",
+    requires_confirmation=False,
+)
+_SAFE_PRESS = ActionClassification(
+    risk=ActionRisk.SAFE,
+    reason="Regular key press",
+    requires_confirmation=False,
+)
+_MODERATE_UNKNOWN = ActionClassification(
+    risk=ActionRisk.MODERATE,
+    reason="Unknown action type",
+    requires_confirmation=False,
+)
+_DESTRUCTIVE_PAYMENT_SUBMIT = ActionClassification(
+    risk=ActionRisk.DESTRUCTIVE,
+    reason="Submit/confirm action on payment-related page",
+    requires_confirmation=True,
+)
+_DESTRUCTIVE_CARD_NUMBER = ActionClassification(
+    risk=ActionRisk.DESTRUCTIVE,
+    reason="Text appears to be payment card number",
+    requires_confirmation=True,
+)
+_MODERATE_PAYMENT_ENTER = ActionClassification(
+    risk=ActionRisk.MODERATE,
+    reason="Enter key on payment-related page",
+    requires_confirmation=True,
+)
+
+
 class SecurityPolicy:
     """Evaluates actions for security risks."""
 
+    def __init__(self) -> None:
+        # Classification is a pure function of its normalized inputs
+        self._classify_cached = lru_cache(maxsize=4096)(self._classify)
+
     def classify_action(
         self,
         tool_name: str,
         args: dict[str, Any],
         page_url: str = "",
-        page_text: str = "",
     ) -> ActionClassification:
         """
         Classify an action's risk level.
 
+        Only the selector, text and keys arguments and the page URL affect
+        the result, so repeated classifications are served from a cache.
+        Typed text is reduced to whether it looks like a card number first,
+        so no typed value is kept in the cache.
+
         Returns ActionClassification with risk level and whether
         user confirmation is required.
         """
+        looks_like_card = (
+            tool_name == "type_text"
+            and _CARD_DIGITS_RE.match(str(args.get("text", ""))) is not None
+        )
+        return self._classify_cached(
+            tool_name,
+            str(args.get("selector", "")).lower(),
+            looks_like_card,
+            str(args.get("keys", "")).lower(),
+            page_url.lower(),
+        )
+
+    def _classify(
+        self,
+        tool_name: str,
+        selector: str,
+        looks_like_card: bool,
+        keys: str,
+        page_url: str,
+    ) -> ActionClassification:
+        """Classify an action from its normalized (lowercased) inputs."""
         # Navigation is generally safe
-        if tool_name in ["navigate_to_url", "get_current_url", "take_screenshot", "wait", "scroll"]:
-            return ActionClassification(
-                risk=ActionRisk.SAFE,
-                reason="Read-only or navigation action",
-                requires_confirmation=False,
-            )
+        if tool_name in ("navigate_to_url", "get_current_url", "take_screenshot", "wait", "scroll"):
+            return _SAFE_NAVIGATION
 
         # query_dom and close_popups are safe
-        if tool_name in ["query_dom", "close_popups", "hover", "back"]:
-            return ActionClassification(
-                risk=ActionRisk.SAFE,
-                reason="Non-modifying action",
-                requires_confirmation=False,
-            )
+        if tool_name in ("query_dom", "close_popups", "hover", "back"):
+            return _SAFE_NON_MODIFYING
 
         # For click actions, analyze what's being clicked
         if tool_name == "click":
-            return self._classify_click(args, page_url, page_text)
+            return self._classify_click(selector, page_url)
 
         # For type actions, check if it's sensitive data
         if tool_name == "type_text":
-            return self._classify_type(args, page_url)
+            return self._classify_type(selector, looks_like_card)
 
         # For press actions, check for Enter on forms
         if tool_name == "press":
-            return self._classify_press(args, page_url, page_text)
+            return self._classify_press(keys, page_url)
 
         # Default to moderate for unknown tools
-        return ActionClassification(
-            risk=ActionRisk.MODERATE,
-            reason="Unknown action type",
-            requires_confirmation=False,
-        )
+        return _MODERATE_UNKNOWN
 
-    def _classify_click(
-        self,
-        args: dict[str, Any],
-        page_url: str,
-        page_text: str,
-    ) -> ActionClassification:
+    def _classify_click(self, selector: str, page_url: str) -> ActionClassification:
         """Classify a click action."""
-        selector = str(args.get("selector", "")).lower()
-
-        # Check if clicking something that sounds destructive
-        for keyword in DESTRUCTIVE_KEYWORDS:
-            if keyword in selector:
+        risky = False
+        for match in _CLICK_RE.finditer(selector):
+            if match.lastgroup is None:
+                # Clicking something that sounds destructive
                 return ActionClassification(
                     risk=ActionRisk.DESTRUCTIVE,
-                    reason=f"Click on element containing '{keyword}'",
+                    reason=f"Click on element containing '{match.group()}'",
                     requires_confirmation=True,
                 )
+            risky = True
 
-        # Check if on a payment page
-        url_lower = page_url.lower()
-        for pattern in PAYMENT_URL_PATTERNS:
-            if pattern in url_lower:
-                # On payment page, be more careful
-                risky_keywords = ["submit", "confirm", "order"]
-                if any(kw in selector for kw in risky_keywords):
-                    return ActionClassification(
-                        risk=ActionRisk.DESTRUCTIVE,
-                        reason="Submit/confirm action on payment-related page",
-                        requires_confirmation=True,
-                    )
-
-        return ActionClassification(
-            risk=ActionRisk.SAFE,
-            reason="Regular click action",
-            requires_confirmation=False,
-        )
+        # On payment page, be more careful
+        if risky and _is_payment_url(page_url):
+            return _DESTRUCTIVE_PAYMENT_SUBMIT
 
-    def _classify_type(
-        self,
-        args: dict[str, Any],
-        page_url: str,
-    ) -> ActionClassification:
-        """Classify a type action."""
-        selector = str(args.get("selector", "")).lower()
-        text = str(args.get("text", ""))
+        return _SAFE_CLICK
 
+    def _classify_type(self, selector: str, looks_like_card: bool) -> ActionClassification:
+        """Classify a type action."""
         # Check if typing into sensitive field
-        for keyword in SENSITIVE_INPUT_KEYWORDS:
-            if keyword in selector:
-                return ActionClassification(
-                    risk=ActionRisk.DESTRUCTIVE,
-                    reason=f"Typing into sensitive field containing '{keyword}'",
-                    requires_confirmation=True,
-                )
+        match = _SENSITIVE_INPUT_RE.search(selector)
+        if match:
+            return ActionClassification(
+                risk=ActionRisk.DESTRUCTIVE,
+                reason=f"Typing into sensitive field containing '{match.group()}'",
+                requires_confirmation=True,
+            )
 
-        # Text that looks like payment info
-        if any(c.isdigit() for c in text):
-            # Check for card number patterns (16 digits with optional spaces/dashes)
-            digits_only = "".join(c for c in text if c.isdigit())
-            if len(digits_only) >= 13:
-                return ActionClassification(
-                    risk=ActionRisk.DESTRUCTIVE,
-                    reason="Text appears to be payment card number",
-                    requires_confirmation=True,
-                )
+        # Text that looks like payment info: card numbers have 13+ digits,
+        # possibly separated by spaces/dashes (checked by classify_action)
+        if looks_like_card:
+            return _DESTRUCTIVE_CARD_NUMBER
 
-        return ActionClassification(
-            risk=ActionRisk.SAFE,
-            reason="Regular text input",
-            requires_confirmation=False,
-        )
+        return _SAFE_TYPE
 
-    def _classify_press(
-        self,
-        args: dict[str, Any],
-        page_url: str,
-        page_text: str,
-    ) -> ActionClassification:
+    def _classify_press(self, keys: str, page_url: str) -> ActionClassification:
         """Classify a key press action."""
-        keys = str(args.get("keys", "")).lower()
-
         # Enter key might submit forms
-        if "enter" in keys:
-            url_lower = page_url.lower()
-            # On payment/order pages, Enter is risky
-            for pattern in PAYMENT_URL_PATTERNS:
-                if pattern in url_lower:
-                    return ActionClassification(
-                        risk=ActionRisk.MODERATE,
-                        reason="Enter key on payment-related page",
-                        requires_confirmation=True,
-                    )
-
-        return ActionClassification(
-            risk=ActionRisk.SAFE,
-            reason="Regular key press",
-            requires_confirmation=False,
-        )
+        # On payment/order pages, Enter is risky
+        if "enter" in keys and _is_payment_url(page_url):
+            return _MODERATE_PAYMENT_ENTER
+
+        return _SAFE_PRESS
 
     def format_confirmation_request(
         self,
@@ -222,17 +278,37 @@ class SecurityPolicy:
 
     def _describe_action(self, tool_name: str, args: dict[str, Any]) -> str:
         """Create human-readable action description."""
-        if tool_name == "click":
-            return f"Click on element: {args.get('selector', 'unknown')}"
-        if tool_name == "type_text":
-            text = args.get("text", "")
-            if len(text) > 30:
-                text = text[:27] + "..."
-            return f"Type '{text}' into {args.get('selector', 'unknown')}"
-        if tool_name == "press":
-            return f"Press key: {args.get('keys', 'unknown')}"
+        describe = _DESCRIBERS.get(tool_name)
+        if describe is not None:
+            return describe(args)
         return f"{tool_name}({args})"
 
 
+def _describe_click(args: dict[str, Any]) -> str:
+    """Describe a click action."""
+    return f"Click on element: {args.get('selector', 'unknown')}"
+
+
+def _describe_type(args: dict[str, Any]) -> str:
+    """Describe a type action, truncating long text."""
+    text = args.get("text", "")
+    if len(text) > 30:
+        text = text[:27] + "..."
+    return f"Type '{text}' into {args.get('selector', 'unknown')}"
+
+
+def _describe_press(args: dict[str, Any]) -> str:
+    """Describe a key press action."""
+    return f"Press key: {args.get('keys', 'unknown')}"
+
+
+# Confirmation descriptions by tool name; other tools fall back to name(args)
+_DESCRIBERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "click": _describe_click,
+    "type_text": _describe_type,
+    "press": _describe_press,
+}
+
+
 # Global policy instance
 security_policy = SecurityPolicy()
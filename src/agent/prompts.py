@@ -73,9 +73,8 @@ Think step by step:
 Keep your reasoning brief. Focus on actions."""
 
 
-def create_task_prompt(task: str, observation: str, history_summary: str) -> str:
-    """Create a prompt for the current task step."""
-    return f"""## Current Task
+# Step prompt template, bound to str.format once at import
+_TASK_TEMPLATE = """## Current Task
 {task}
 
 ## Current Page State
@@ -86,19 +85,22 @@ def create_task_prompt(task: str, observation: str, history_summary: str) -> str
 
 ## Your Turn
 Analyze the current state and take the next action toward completing the task.
-If you need to interact with an element, first use query_dom to find it."""
+If you need to interact with an element, first use query_dom to find it.""".format
 
 
-def create_dom_analyst_prompt(query: str, candidates: list[dict]) -> str:
-    """Create a prompt for the DOM analyst sub-agent."""
-    candidates_text = "\n".join(
-        f"- [{c.get('id')}] {c.get('role')}: \"{c.get('text', '')}\" "
-        f"(selector: {c.get('selector', 'N/A')})"
-        for c in candidates
-    )
+def create_task_prompt(task: str, observation: str, history_summary: str) -> str:
+    """Create a prompt for the current task step."""
+    return _TASK_TEMPLATE(task=task, observation=observation, history_summary=history_summary)
 
-    return f"""Analyze these interactive elements and select the best match for: "{query}"
 
+# Candidate line template and the values used for missing fields
+_CANDIDATE_LINE = '- [{id}] {role}: "{text}" (selector: {selector})'
+_CANDIDATE_DEFAULTS = {"id": None, "role": None, "text": "", "selector": "N/A"}
+
+
+_DOM_ANALYST_TEMPLATE = (
+    'Analyze these interactive elements and select the best match for: "{query}"\n'
+    """
 ## Candidates
 {candidates_text}
 
@@ -108,3 +110,12 @@ def create_dom_analyst_prompt(query: str, candidates: list[dict]) -> str:
 3. If no good match, suggest what to search for instead
 
 Respond with just the ID number or "NONE: [suggestion]"."""
+).format
+
+
+def create_dom_analyst_prompt(query: str, candidates: list[dict]) -> str:
+    """Create a prompt for the DOM analyst sub-agent."""
+    candidates_text = "\n".join([
+        _CANDIDATE_LINE.format_map(_CANDIDATE_DEFAULTS | c) for c in candidates
+    ])
+    return _DOM_ANALYST_TEMPLATE(query=query, candidates_text=candidates_text)
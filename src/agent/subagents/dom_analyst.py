@@ -1,5 +1,9 @@
 """DOM Analyst sub-agent for element selection."""
 
+import hashlib
+import re
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 
 from src.app.i18n import t
@@ -7,6 +11,33 @@ from src.app.logging import RunLogger
 from src.llm.base import LLMProvider
 
 
+def _format_candidate(index: int, candidate: dict[str, Any]) -> str:
+    """Format one candidate as a line for the selection prompt."""
+    line = f"[{index}] {candidate.get('role', 'unknown')}: \"{candidate.get('text', '')[:50]}\""
+    aria = candidate.get("aria_label")
+    if aria:
+        line += f" aria-label=\"{aria}\""
+    placeholder = candidate.get("placeholder")
+    if placeholder:
+        line += f" placeholder=\"{placeholder}\""
+    return line
+
+
+_SCORE_KEY = itemgetter("score")
+
+# First run of digits in an LLM reply, e.g. "2" or "Candidate 10"
+_LLM_IDX_RE = re.compile(r"\d+")
+
+# Upper bound on remembered LLM selections per analyst
+_LLM_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=1024)
+def _tokenize(text: str) -> frozenset[str]:
+    """Split candidate text into words, cached across scoring rounds."""
+    return frozenset(text.split())
+
+
 class DOMAnalyst:
     """
     Sub-agent specialized in analyzing DOM elements and selecting
@@ -16,6 +47,8 @@ class DOMAnalyst:
     def __init__(self, llm: LLMProvider, logger: RunLogger):
         self.llm = llm
         self.logger = logger
+        # Normalized LLM replies keyed by a digest of the selection prompt
+        self._llm_cache: dict[bytes, str] = {}
 
     async def analyze_candidates(
         self,
@@ -93,63 +126,79 @@ class DOMAnalyst:
         query: str,
         candidates: list[dict[str, Any]],
     ) -> list[dict[str, Any]]:
-        """Score candidates by relevance to query."""
+        """
+        Score candidates by relevance to query.
+
+        Scoring stops at the first candidate with a perfect score, so the
+        result may omit later candidates that could not have ranked first.
+        """
         query_lower = query.lower()
         query_words = set(query_lower.split())
 
+        # Role bonuses depend only on the query, so resolve them once
+        wants_button = "button" in query_lower
+        wants_input = "input" in query_lower
+        wants_link = "link" in query_lower
+
         scored = []
         for c in candidates:
             score = 0.0
 
-            # Get all text fields
+            # Get all non-empty text fields (an empty field would otherwise
+            # count as "contained in" every query)
             text_fields = [
-                c.get("text", "").lower(),
-                c.get("aria_label", "").lower(),
-                c.get("placeholder", "").lower(),
-                c.get("name", "").lower(),
+                field.lower()
+                for field in (
+                    c.get("text", ""),
+                    c.get("aria_label", ""),
+                    c.get("placeholder", ""),
+                    c.get("name", ""),
+                )
+                if field
             ]
 
-            combined_text = " ".join(text_fields)
-
             # Exact match bonus
-            for field in text_fields:
-                if query_lower == field:
-                    score = 1.0
-                    break
+            if query_lower in text_fields:
+                score = 1.0
 
             # Contains match
-            if score < 1.0:
+            else:
                 for field in text_fields:
                     if query_lower in field:
                         score = max(score, 0.8)
                     elif field in query_lower:
                         score = max(score, 0.7)
 
-            # Word overlap
-            if score < 0.7:
-                combined_words = set(combined_text.split())
+            # Word overlap (only needed when no substring match was found)
+            if score < 0.7 and query_words:
+                combined_words = _tokenize(" ".join(text_fields))
                 overlap = len(query_words & combined_words)
-                if query_words:
-                    word_score = overlap / len(query_words) * 0.6
-                    score = max(score, word_score)
+                score = max(score, overlap / len(query_words) * 0.6)
 
             # Role relevance bonus
-            role = c.get("role", "").lower()
-            if "button" in query_lower and "button" in role:
-                score += 0.1
-            if "input" in query_lower and "input" in role:
-                score += 0.1
-            if "link" in query_lower and ("link" in role or "a" == role):
-                score += 0.1
+            if wants_button or wants_input or wants_link:
+                role = c.get("role", "").lower()
+                if wants_button and "button" in role:
+                    score += 0.1
+                if wants_input and "input" in role:
+                    score += 0.1
+                if wants_link and ("link" in role or "a" == role):
+                    score += 0.1
 
             # Viewport bonus - prefer visible elements
             if c.get("in_viewport", False):
                 score += 0.05
 
-            scored.append({**c, "score": min(score, 1.0)})
+            score = min(score, 1.0)
+            scored.append({**c, "score": score})
+
+            # Nothing can outrank the first perfect score (the sort is
+            # stable), so the remaining candidates need not be scored
+            if score == 1.0:
+                break
 
         # Sort by score descending
-        scored.sort(key=lambda x: x["score"], reverse=True)
+        scored.sort(key=_SCORE_KEY, reverse=True)
         return scored
 
     async def _llm_select(
@@ -159,21 +208,10 @@ class DOMAnalyst:
         context: str,
     ) -> dict[str, Any]:
         """Use LLM to select best candidate for ambiguous cases."""
-        # Format candidates for LLM
-        candidates_text = []
-        for i, c in enumerate(candidates[:8]):  # Limit to 8 for context
-            text = c.get("text", "")[:50]
-            role = c.get("role", "unknown")
-            aria = c.get("aria_label", "")
-            placeholder = c.get("placeholder", "")
-
-            desc_parts = [f"[{i}] {role}: \"{text}\""]
-            if aria:
-                desc_parts.append(f"aria-label=\"{aria}\"")
-            if placeholder:
-                desc_parts.append(f"placeholder=\"{placeholder}\"")
-
-            candidates_text.append(" ".join(desc_parts))
+        # Format candidates for LLM (limit to 8 for context)
+        candidates_text = [
+            _format_candidate(i, c) for i, c in enumerate(candidates[:8])
+        ]
 
         prompt = f"""Select the element that best matches: "{query}"
 
@@ -184,14 +222,23 @@ Candidates:
 
 Reply with just the number (e.g., "0" or "2") or "none" if no match."""
 
-        try:
-            response = await self.llm.chat(
-                messages=[{"role": "user", "content": prompt}],
-                tools=[],
-                system_prompt="You are a DOM element selector. Be concise.",
-            )
+        # The prompt covers the query, candidates and context, so an identical
+        # prompt gets the same answer without another LLM round-trip
+        cache_key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
 
-            content = (response.content or "").strip().lower()
+        try:
+            content = self._llm_cache.get(cache_key)
+            if content is None:
+                response = await self.llm.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    tools=[],
+                    system_prompt="You are a DOM element selector. Be concise.",
+                )
+                content = (response.content or "").strip().lower()
+                if len(self._llm_cache) >= _LLM_CACHE_SIZE:
+                    # Dicts keep insertion order, so this drops the oldest entry
+                    del self._llm_cache[next(iter(self._llm_cache))]
+                self._llm_cache[cache_key] = content
 
             # Parse response
             if content == "none":
@@ -203,17 +250,16 @@ Reply with just the number (e.g., "0" or "2") or "none" if no match."""
                 }
 
             # Try to extract number
-            for char in content:
-                if char.isdigit():
-                    idx = int(char)
-                    if 0 <= idx < len(candidates):
-                        return {
-                            "selected_id": candidates[idx].get("id", idx),
-                            "selector": candidates[idx].get("selector"),
-                            "confidence": 0.7,
-                            "reason": "LLM selection",
-                        }
-                    break
+            match = _LLM_IDX_RE.search(content)
+            if match:
+                idx = int(match.group())
+                if 0 <= idx < len(candidates):
+                    return {
+                        "selected_id": candidates[idx].get("id", idx),
+                        "selector": candidates[idx].get("selector"),
+                        "confidence": 0.7,
+                        "reason": "LLM selection",
+                    }
 
         except Exception as e:
             self.logger.log_error(f"DOM Analyst LLM error: {e}")
@@ -2,27 +2,30 @@
 
 import asyncio
 import sys
+from functools import cache
+from typing import TYPE_CHECKING, Callable
 
-from src.agent.orchestrator import AgentStatus, Orchestrator
 from src.app.config import config
 from src.app.logging import (
     RunLogger,
+    ainput,
     console,
     create_run_logger,
     get_user_input,
     print_welcome,
     print_task_start,
 )
-from src.browser.controller import BrowserController
 from src.llm.base import LLMProvider
-from src.tools.actions import register_action_tools
-from src.tools.dom import register_dom_tools
-from src.tools.registry import registry
-from src.tools.screenshots import register_screenshot_tools
 
+# The browser, agent and tool modules (and Playwright behind them) are
+# imported where first used, so config errors exit without loading them
+if TYPE_CHECKING:
+    from src.browser.controller import BrowserController
 
+
+@cache
 def get_llm_provider() -> LLMProvider:
-    """Get the configured LLM provider."""
+    """Get the configured LLM provider (created once per process)."""
     if config.LLM_PROVIDER == "anthropic":
         from src.llm.anthropic_provider import AnthropicProvider
         return AnthropicProvider()
@@ -32,26 +35,35 @@ def get_llm_provider() -> LLMProvider:
 
 
 async def run_agent_loop(
-    browser: BrowserController,
+    browser: "BrowserController",
     llm: LLMProvider,
     logger: RunLogger,
 ) -> None:
     """Main agent interaction loop."""
+    from src.agent.orchestrator import AgentStatus, Orchestrator
+    from src.tools.actions import register_action_tools
+    from src.tools.dom import register_dom_tools
+    from src.tools.registry import registry
+    from src.tools.screenshots import register_screenshot_tools
+
     # Register all tools
     register_action_tools(browser)
     register_dom_tools(browser)
     register_screenshot_tools(browser, logger.screenshots_dir)
 
-    console.print(f"\n[dim]Registered tools: {', '.join(registry.list_tools())}[/dim]")
-    console.print(f"[dim]Logs: {logger.log_file}[/dim]")
-    console.print(f"[dim]Screenshots: {logger.screenshots_dir}[/dim]\n")
+    console.print(
+        f"\n[dim]Registered tools: {', '.join(registry.list_tools())}[/dim]\n"
+        f"[dim]Logs: {logger.log_file}[/dim]\n"
+        f"[dim]Screenshots: {logger.screenshots_dir}[/dim]\n"
+    )
 
     orchestrator = Orchestrator(browser, llm, logger)
 
     while True:
         # Get task from user
         try:
-            task = input("\n[Task] > ").strip()
+            # Read without blocking the loop, so the browser keeps being serviced
+            task = (await ainput("\n[Task] > ")).strip()
         except (EOFError, KeyboardInterrupt):
             console.print("\n[dim]Exiting...[/dim]")
             break
@@ -68,7 +80,7 @@ async def run_agent_loop(
             continue
 
         if task.lower() == "url":
-            url = await browser.get_url()
+            url = browser.get_url()
             console.print(f"[cyan]Current URL:[/cyan] {url}")
             continue
 
@@ -97,7 +109,7 @@ async def run_agent_loop(
             # Handle different statuses
             if result.status == AgentStatus.NEED_USER_INPUT:
                 console.print(f"\n[yellow]Agent needs input:[/yellow] {result.summary}")
-                user_response = get_user_input("Your response:")
+                user_response = await get_user_input("Your response:")
                 if user_response:
                     # Continue with user input
                     new_task = f"{task}\n\nUser provided: {user_response}"
@@ -156,10 +168,14 @@ async def main_async() -> None:
 
     print_welcome()
 
-    console.print(f"[dim]LLM Provider: {config.LLM_PROVIDER}[/dim]")
-    console.print(f"[dim]Model: {config.get_model_name()}[/dim]")
-    console.print(f"[dim]Profile: {config.USER_DATA_DIR}[/dim]")
-    console.print(f"[dim]Headless: {config.HEADLESS}[/dim]")
+    console.print(
+        f"[dim]LLM Provider: {config.LLM_PROVIDER}[/dim]\n"
+        f"[dim]Model: {config.get_model_name()}[/dim]\n"
+        f"[dim]Profile: {config.USER_DATA_DIR}[/dim]\n"
+        f"[dim]Headless: {config.HEADLESS}[/dim]"
+    )
+
+    from src.browser.controller import BrowserController
 
     # Initialize components
     browser = BrowserController()
@@ -183,10 +199,20 @@ async def main_async() -> None:
         console.print("[dim]Done.[/dim]")
 
 
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Use uvloop's event loop when it is installed, else asyncio's default."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    new_event_loop: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+    return new_event_loop
+
+
 def main() -> None:
     """Main entry point."""
     try:
-        asyncio.run(main_async())
+        asyncio.run(main_async(), loop_factory=_event_loop_factory())
     except KeyboardInterrupt:
         console.print("\n[dim]Interrupted.[/dim]")
 
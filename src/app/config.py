@@ -1,6 +1,7 @@
 """Configuration management."""
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
@@ -9,73 +10,112 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration loaded from environment variables."""
+    """Application configuration, read once from environment variables."""
 
     # LLM Settings
-    LLM_PROVIDER: Literal["anthropic", "openai"] = os.getenv("LLM_PROVIDER", "anthropic")  # type: ignore
-    ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    LLM_PROVIDER: Literal["anthropic", "openai"]
+    ANTHROPIC_API_KEY: str
+    OPENAI_API_KEY: str
 
     # Model names
-    ANTHROPIC_MODEL: str = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
-    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    ANTHROPIC_MODEL: str
+    OPENAI_MODEL: str
 
     # Browser Settings
-    USER_DATA_DIR: Path = Path(os.getenv("USER_DATA_DIR", "./profiles/default"))
-    HEADLESS: bool = os.getenv("HEADLESS", "false").lower() == "true"
-    BROWSER_TIMEOUT: int = int(os.getenv("BROWSER_TIMEOUT", "30000"))  # ms
-    VIEWPORT_WIDTH: int = int(os.getenv("VIEWPORT_WIDTH", "1280"))
-    VIEWPORT_HEIGHT: int = int(os.getenv("VIEWPORT_HEIGHT", "900"))
+    USER_DATA_DIR: Path
+    HEADLESS: bool
+    BROWSER_TIMEOUT: int  # ms
+    VIEWPORT_WIDTH: int
+    VIEWPORT_HEIGHT: int
 
     # Agent Settings
-    MAX_STEPS: int = int(os.getenv("MAX_STEPS", "50"))
-    MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
-    QUERY_DOM_LIMIT: int = int(os.getenv("QUERY_DOM_LIMIT", "12"))
-    MAX_HISTORY_STEPS: int = int(os.getenv("MAX_HISTORY_STEPS", "10"))
+    MAX_STEPS: int
+    MAX_RETRIES: int
+    QUERY_DOM_LIMIT: int
+    MAX_HISTORY_STEPS: int
 
     # Output Settings
-    OUTPUT_RUNS_DIR: Path = Path(os.getenv("OUTPUT_RUNS_DIR", "./runs"))
+    OUTPUT_RUNS_DIR: Path
 
     # Timing
-    DEFAULT_WAIT_TIMEOUT: float = float(os.getenv("DEFAULT_WAIT_TIMEOUT", "2.0"))
-    ACTION_DELAY: float = float(os.getenv("ACTION_DELAY", "0.5"))
+    DEFAULT_WAIT_TIMEOUT: float
+    ACTION_DELAY: float
 
     # Context limits (approximate token counts)
-    MAX_OBSERVATION_LENGTH: int = int(os.getenv("MAX_OBSERVATION_LENGTH", "2000"))
-    MAX_DOM_TEXT_LENGTH: int = int(os.getenv("MAX_DOM_TEXT_LENGTH", "200"))
+    MAX_OBSERVATION_LENGTH: int
+    MAX_DOM_TEXT_LENGTH: int
 
     # Language Settings
-    LANGUAGE: str = os.getenv("LANGUAGE", "auto")
+    LANGUAGE: str
 
     # Browser locale/timezone (empty = auto-detect)
-    BROWSER_LOCALE: str = os.getenv("BROWSER_LOCALE", "")
-    BROWSER_TIMEZONE: str = os.getenv("BROWSER_TIMEZONE", "")
+    BROWSER_LOCALE: str
+    BROWSER_TIMEZONE: str
 
-    @classmethod
-    def get_api_key(cls) -> str:
+    def get_api_key(self) -> str:
         """Get the API key for the configured provider."""
-        if cls.LLM_PROVIDER == "anthropic":
-            if not cls.ANTHROPIC_API_KEY:
+        if self.LLM_PROVIDER == "anthropic":
+            if not self.ANTHROPIC_API_KEY:
                 raise ValueError("ANTHROPIC_API_KEY not set")
-            return cls.ANTHROPIC_API_KEY
+            return self.ANTHROPIC_API_KEY
         else:
-            if not cls.OPENAI_API_KEY:
+            if not self.OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY not set")
-            return cls.OPENAI_API_KEY
+            return self.OPENAI_API_KEY
 
-    @classmethod
-    def get_model_name(cls) -> str:
+    def get_model_name(self) -> str:
         """Get the model name for the configured provider."""
-        if cls.LLM_PROVIDER == "anthropic":
-            return cls.ANTHROPIC_MODEL
-        return cls.OPENAI_MODEL
+        if self.LLM_PROVIDER == "anthropic":
+            return self.ANTHROPIC_MODEL
+        return self.OPENAI_MODEL
 
-    @classmethod
-    def ensure_dirs(cls) -> None:
+    def ensure_dirs(self) -> None:
         """Ensure required directories exist."""
-        cls.USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
-        cls.OUTPUT_RUNS_DIR.mkdir(parents=True, exist_ok=True)
-
-
-config = Config()
+        ensure_dir(self.USER_DATA_DIR)
+        ensure_dir(self.OUTPUT_RUNS_DIR)
+
+
+# Directories already created (or found) by this process
+_ensured_dirs: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> None:
+    """Create a directory and its parents, at most once per path per process."""
+    if path in _ensured_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
+def _load_config() -> Config:
+    """Read every setting from the environment exactly once."""
+    getenv = os.getenv
+    return Config(
+        LLM_PROVIDER=getenv("LLM_PROVIDER", "anthropic"),  # type: ignore[arg-type]
+        ANTHROPIC_API_KEY=getenv("ANTHROPIC_API_KEY", ""),
+        OPENAI_API_KEY=getenv("OPENAI_API_KEY", ""),
+        ANTHROPIC_MODEL=getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514"),
+        OPENAI_MODEL=getenv("OPENAI_MODEL", "gpt-4o"),
+        USER_DATA_DIR=Path(getenv("USER_DATA_DIR", "./profiles/default")),
+        HEADLESS=getenv("HEADLESS", "false").lower() == "true",
+        BROWSER_TIMEOUT=int(getenv("BROWSER_TIMEOUT", "30000")),
+        VIEWPORT_WIDTH=int(getenv("VIEWPORT_WIDTH", "1280")),
+        VIEWPORT_HEIGHT=int(getenv("VIEWPORT_HEIGHT", "900")),
+        MAX_STEPS=int(getenv("MAX_STEPS", "50")),
+        MAX_RETRIES=int(getenv("MAX_RETRIES", "3")),
+        QUERY_DOM_LIMIT=int(getenv("QUERY_DOM_LIMIT", "12")),
+        MAX_HISTORY_STEPS=int(getenv("MAX_HISTORY_STEPS", "10")),
+        OUTPUT_RUNS_DIR=Path(getenv("OUTPUT_RUNS_DIR", "./runs")),
+        DEFAULT_WAIT_TIMEOUT=float(getenv("DEFAULT_WAIT_TIMEOUT", "2.0")),
+        ACTION_DELAY=float(getenv("ACTION_DELAY", "0.5")),
+        MAX_OBSERVATION_LENGTH=int(getenv("MAX_OBSERVATION_LENGTH", "2000")),
+        MAX_DOM_TEXT_LENGTH=int(getenv("MAX_DOM_TEXT_LENGTH", "200")),
+        LANGUAGE=getenv("LANGUAGE", "auto"),
+        BROWSER_LOCALE=getenv("BROWSER_LOCALE", ""),
+        BROWSER_TIMEZONE=getenv("BROWSER_TIMEZONE", ""),
+    )
+
+
+config = _load_config()
@@ -186,14 +186,30 @@ _translations = {
     "en": EN_TRANSLATIONS,
 }
 
+# Per-language tables with English fallbacks merged in at import. Only
+# templates with placeholders get a pre-bound format_map; the rest are
+# returned as-is even when arguments are passed.
+_tables = {lang: EN_TRANSLATIONS | tr for lang, tr in _translations.items()}
+_formatters = {
+    lang: {key: template.format_map for key, template in table.items() if "{" in template}
+    for lang, table in _tables.items()
+}
+
+
+# Table and formatters for the current language, rebound by set_language
+_current_table = _tables[_current_lang]
+_current_formatters = _formatters[_current_lang]
+
 
 def set_language(lang: str) -> None:
     """Set the current language (ru/en/auto). Auto defaults to en."""
-    global _current_lang
+    global _current_lang, _current_table, _current_formatters
     if lang in _translations:
         _current_lang = lang
     elif lang == "auto":
         _current_lang = "en"
+    _current_table = _tables[_current_lang]
+    _current_formatters = _formatters[_current_lang]
 
 
 def get_language() -> str:
@@ -212,10 +228,15 @@ def t(key: str, **kwargs: Any) -> str:
     Returns:
         Translated string
     """
-    translations = _translations.get(_current_lang, EN_TRANSLATIONS)
-    template = translations.get(key, EN_TRANSLATIONS.get(key, key))
+    # Plain labels are the common case: a single lookup, no formatting
+    if not kwargs:
+        return _current_table.get(key, key)
+
+    formatter = _current_formatters.get(key)
+    if formatter is None:
+        return _current_table.get(key, key)
 
     try:
-        return template.format(**kwargs) if kwargs else template
+        return formatter(kwargs)
     except KeyError:
-        return template
+        return _current_table[key]
@@ -1,18 +1,328 @@
 """Logging utilities for tool calls and agent actions with i18n support."""
 
+import asyncio
 import json
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+import orjson
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from src.app.config import config, ensure_dir
 from src.app.i18n import t, set_language
 
 console = Console()
 
+# Without a terminal (or with NO_COLOR) there is nothing to style, so
+# tool-call lines are written as plain text instead of rendered by Rich
+_PLAIN_TOOL_LINES = not console.is_terminal or console.no_color
+
+# Non-string dict keys are stringified, as the stdlib json module does
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+# Log entries come out of orjson already newline-terminated
+_ORJSON_LINE_OPTS = _ORJSON_OPTS | orjson.OPT_APPEND_NEWLINE
+
+
+def _dumps(value: Any, option: int = _ORJSON_OPTS) -> bytes:
+    """Serialize with orjson, falling back to json for values orjson rejects."""
+    try:
+        return orjson.dumps(value, default=str, option=option)
+    except orjson.JSONEncodeError:
+        # e.g. ints wider than 64 bits, which the json module handles
+        data = json.dumps(value, default=str, ensure_ascii=False, skipkeys=True).encode()
+        return data + b"\n" if option & orjson.OPT_APPEND_NEWLINE else data
+
+# Backlog limits for the writer; past either one the oldest lines are dropped
+_MAX_QUEUED_LINES = 20_000
+_MAX_QUEUED_BYTES = 5_000_000
+
+# Buffered lines are written out once this many accumulate, or after this many
+# seconds (also when the writer goes idle), or right away for errors
+_FLUSH_EVERY = 32
+_FLUSH_INTERVAL = 1.0
+
+# Icon and Russian description key by tool type
+_TOOL_INFO: dict[str, tuple[str, str | None]] = {
+    "navigate_to_url": ("🌐", "tool_navigating"),
+    "click": ("👆", "tool_clicking"),
+    "type_text": ("⌨️", "tool_typing"),
+    "press": ("⏎", "tool_pressing"),
+    "scroll": ("📜", "tool_scrolling"),
+    "query_dom": ("🔍", "tool_searching_dom"),
+    "get_all_elements": ("📋", None),
+    "wait": ("⏳", "tool_waiting"),
+    "hover": ("👆", "tool_hovering"),
+    "back": ("⬅️", "tool_going_back"),
+    "take_screenshot": ("📸", "tool_screenshot"),
+    "close_popups": ("❌", "tool_closing_popups"),
+    "get_current_url": ("🔗", "tool_getting_url"),
+}
+_DEFAULT_TOOL_INFO: tuple[str, str | None] = ("🔧", None)
+
+# Final report icon, title key and border style by status. Titles are kept as
+# i18n keys so they follow the current language.
+_REPORT_STYLES: dict[str, tuple[str, str, str]] = {
+    "done": ("✅", "report_task_completed", "green"),
+    "failed": ("❌", "report_task_failed", "red"),
+    "need_user_input": ("⏸️", "report_waiting_user", "yellow"),
+}
+_DEFAULT_REPORT_STYLE = ("ℹ️", "report_execution_finished", "blue")
+
+# Styled "  icon tool(" prefixes and status marks, built once as Text so the
+# tool-call line needs no markup parsing (arguments often contain brackets)
+_TOOL_PREFIX: dict[str, Text] = {
+    name: Text.assemble(f"  {icon} ", (name, "blue"), "(")
+    for name, (icon, _) in _TOOL_INFO.items()
+}
+_STATUS_TEXT = {True: Text("✓", style="green"), False: Text("✗", style="red")}
+
+
+def _format_arg(key: str, value: Any) -> str:
+    """Format one tool argument for the console, truncating long strings."""
+    if type(value) is str:
+        if len(value) > 40:
+            return f'{key}="{value[:37]}..."'
+        return f'{key}="{value}"'
+    return f"{key}={value}"
+
+
+# Console width budget for a tool call's arguments; later ones are elided
+_ARGS_BUDGET = 120
+
+
+def _format_args(args: dict[str, Any]) -> str:
+    """Format tool arguments for the console, stopping once over budget."""
+    parts: list[str] = []
+    budget = _ARGS_BUDGET
+    for key, value in args.items():
+        part = _format_arg(key, value)
+        budget -= len(part) + 2
+        if budget < 0 and parts:
+            parts.append("...")
+            break
+        parts.append(part)
+    return ", ".join(parts)
+
+
+# Epoch second and its formatted "YYYY-MM-DDTHH:MM:SS" prefix, reused until
+# the second changes
+_timestamp_prefix: tuple[int, str] = (0, "")
+
+
+def _timestamp() -> str:
+    """Local ISO-8601 timestamp with microseconds, for log entries."""
+    global _timestamp_prefix
+    now = time.time()
+    second = int(now)
+    if second != _timestamp_prefix[0]:
+        _timestamp_prefix = (
+            second,
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second)),
+        )
+    return f"{_timestamp_prefix[1]}.{int((now - second) * 1_000_000):06d}"
+
+
+class _JsonlWriter:
+    """
+    Appends JSONL lines to a file from a background thread.
+
+    The backlog is bounded by line count and by bytes. When either limit is
+    hit the oldest lines are dropped, so a stalled disk never blocks the
+    agent, and a marker entry records how many were lost.
+    """
+
+    def __init__(self, path: Path):
+        self._lines: deque[tuple[bytes, bool]] = deque()
+        self._queued_bytes = 0
+        self._dropped = 0
+        self._closing = False
+        self._ready = threading.Condition()
+        # Lines arrive as UTF-8 bytes and are appended with raw os.write calls
+        # on a plain descriptor (binary on Windows, so "\n" isn't translated);
+        # _buffer coalesces them between writes
+        self._fd = os.open(
+            path,
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes, flush: bool = False) -> None:
+        """Queue one serialized, newline-terminated line; never blocks on I/O."""
+        with self._ready:
+            lines = self._lines
+            while lines and (
+                len(lines) >= _MAX_QUEUED_LINES
+                or self._queued_bytes + len(line) > _MAX_QUEUED_BYTES
+            ):
+                oldest, _ = lines.popleft()
+                self._queued_bytes -= len(oldest)
+                self._dropped += 1
+            lines.append((line, flush))
+            self._queued_bytes += len(line)
+            self._ready.notify()
+
+    def close(self) -> None:
+        """Write out everything queued so far and close the file."""
+        with self._ready:
+            self._closing = True
+            self._ready.notify()
+        self._thread.join()
+        os.close(self._fd)
+
+    def _run(self) -> None:
+        """Take the whole backlog at once and write it in one call."""
+        while True:
+            with self._ready:
+                if not self._lines and not self._closing:
+                    self._ready.wait(timeout=_FLUSH_INTERVAL)
+                # Swap buffers: producers fill a fresh deque while this one
+                # is written out, so the lock is held only for the swap
+                batch, self._lines = self._lines, deque()
+                self._queued_bytes = 0
+                dropped, self._dropped = self._dropped, 0
+                done = self._closing
+
+            lines = [line for line, _ in batch]
+            if dropped:
+                # The dropped lines were older than this batch, so mark them first
+                lines.insert(0, orjson.dumps(
+                    {"timestamp": _timestamp(), "type": "dropped", "count": dropped},
+                    option=orjson.OPT_APPEND_NEWLINE,
+                ))
+
+            if lines:
+                self._buffer += b"".join(lines)
+                self._pending += len(lines)
+                if (
+                    any(flush for _, flush in batch)
+                    or self._pending >= _FLUSH_EVERY
+                    or time.monotonic() - self._last_flush > _FLUSH_INTERVAL
+                ):
+                    self._flush()
+            else:
+                # Idle: make sure nothing lingers in the buffer
+                self._flush()
+
+            if done:
+                self._flush()
+                return
+
+    def _flush(self) -> None:
+        """Write buffered lines to the file, if there are any."""
+        if self._pending:
+            view = memoryview(self._buffer)
+            while view:
+                # os.write may accept fewer bytes than given
+                view = view[os.write(self._fd, view):]
+            view.release()
+            self._buffer.clear()
+            self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+# Result summaries. Tool results are plain JSON-like values, so the
+# summarizer is picked by exact type; anything else goes through
+# _summarize_other.
+
+def _summarize_success(result: dict[str, Any]) -> str:
+    """Summarize a result that reports success or failure."""
+    if result.get("success"):
+        if "url" in result:
+            return f"✓ → {result['url']}"
+        if "typed" in result:
+            return t("result_typed", text=result["typed"])
+        if "clicked" in result:
+            return f"✓ {t('result_clicked')}"
+        if "pressed" in result:
+            return t("result_pressed", keys=result["pressed"])
+        if "scrolled" in result:
+            return t("result_scrolled", direction=result["scrolled"])
+        return f"✓ {t('result_success')}"
+    return f"✗ {result.get('error', t('result_failed'))[:50]}"
+
+
+def _summarize_error(result: dict[str, Any]) -> str:
+    """Summarize a result carrying an error message."""
+    error = result["error"]
+    if "Timeout" in error:
+        return f"✗ {t('result_timeout')}"
+    return f"✗ {error[:50]}"
+
+
+def _summarize_candidates(result: dict[str, Any]) -> str:
+    """Summarize a query_dom result."""
+    count = len(result["candidates"])
+    if count > 0:
+        first = result["candidates"][0]
+        text = first.get("text", "")[:30] or first.get("selector", "")[:30]
+        return f"{t('result_found_elements', count=count)} ('{text}'...)"
+    return t("result_no_elements")
+
+
+def _summarize_elements(result: dict[str, Any]) -> str:
+    """Summarize a get_all_elements result."""
+    return t("result_found_elements", count=len(result["elements"]))
+
+
+# Common dict result patterns, probed in order
+_DICT_SUMMARIES: tuple[tuple[str, Callable[[dict[str, Any]], str]], ...] = (
+    ("success", _summarize_success),
+    ("error", _summarize_error),
+    ("candidates", _summarize_candidates),
+    ("elements", _summarize_elements),
+)
+
+
+def _summarize_dict(result: dict[str, Any], max_len: int, result_json: bytes | None) -> str:
+    """Summarize a dict result by its known pattern, else as truncated JSON."""
+    for key, summarize in _DICT_SUMMARIES:
+        if key in result:
+            return summarize(result)
+
+    if result_json is None:
+        result_json = _dumps(result)
+    # A character is at most 4 UTF-8 bytes; "ignore" drops a split tail
+    return result_json[:max_len * 4].decode("utf-8", "ignore")[:max_len]
+
+
+def _summarize_str(result: str, max_len: int, result_json: bytes | None) -> str:
+    """Summarize a string result, truncating it past max_len."""
+    if len(result) > max_len:
+        return f"{result[:max_len]}..."
+    return result
+
+
+def _summarize_other(result: Any, max_len: int, result_json: bytes | None) -> str:
+    """Summarize subclasses of the handled types, or anything else."""
+    for base in (bool, int, float, str, dict, list):
+        if isinstance(result, base):
+            return _SUMMARIZERS[base](result, max_len, result_json)
+    return str(result)[:max_len]
+
+
+_SUMMARIZERS: dict[type, Callable[[Any, int, bytes | None], str]] = {
+    type(None): lambda result, max_len, result_json: "null",
+    bool: lambda result, max_len, result_json: "✓" if result else "✗",
+    int: lambda result, max_len, result_json: str(result),
+    float: lambda result, max_len, result_json: str(result),
+    str: _summarize_str,
+    dict: _summarize_dict,
+    list: lambda result, max_len, result_json: f"[{len(result)} элементов]",
+}
+
 
 class RunLogger:
     """Logger for a single agent run with Russian language support."""
@@ -23,20 +333,18 @@ class RunLogger:
         self.log_file = run_dir / "logs.jsonl"
         self.step_count = 0
 
-        # Create directories
-        self.run_dir.mkdir(parents=True, exist_ok=True)
-        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        # Create directories (the run directory is the screenshots' parent)
+        ensure_dir(self.screenshots_dir)
 
-        # Open log file
-        self._log_handle = open(self.log_file, "a", encoding="utf-8")
+        # Log lines are written off the event loop by a background thread
+        self._writer = _JsonlWriter(self.log_file)
 
         # Initialize language from config
-        from src.app.config import config
         set_language(config.LANGUAGE)
 
     def close(self) -> None:
-        """Close the log file."""
-        self._log_handle.close()
+        """Flush pending log lines and close the log file."""
+        self._writer.close()
 
     def log_tool_call(
         self,
@@ -48,21 +356,29 @@ class RunLogger:
         """Log a tool call with clean formatting."""
         self.step_count += 1
 
+        # Serialize the result once; the entry embeds it and the summary reuses it.
+        # Values JSON can't represent are logged as their str().
+        result_json = _dumps(result)
+
         # Create result summary
-        result_summary = self._summarize_result(result)
+        result_summary = self._summarize_result(result, result_json=result_json)
 
         # Write to file (detailed)
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "step": self.step_count,
             "tool": tool,
             "args": args,
-            "result": result if isinstance(result, (dict, list, str, int, float, bool)) else str(result),
+            "result": orjson.Fragment(result_json),
             "success": success,
         }
-        json_line = json.dumps(entry, ensure_ascii=False)
-        self._log_handle.write(json_line + "\n")
-        self._log_handle.flush()
+        try:
+            line = orjson.dumps(entry, default=str, option=_ORJSON_LINE_OPTS)
+        except orjson.JSONEncodeError:
+            # The json fallback can't embed a Fragment, so pass the raw result
+            entry["result"] = result
+            line = _dumps(entry, _ORJSON_LINE_OPTS)
+        self._writer.write(line)
 
         # Print to console (clean format)
         self._print_tool_call(tool, args, result_summary, success)
@@ -116,12 +432,13 @@ class RunLogger:
         """Log an error."""
         console.print(f"\n[bold red]❌ {t('error')}:[/bold red] {error}")
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "type": "error",
             "message": error,
         }
-        self._log_handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        self._log_handle.flush()
+        self._writer.write(
+            _dumps(entry, _ORJSON_LINE_OPTS), flush=True
+        )
 
     def log_final_report(self, report: dict[str, Any]) -> None:
         """Log the final execution report."""
@@ -130,22 +447,8 @@ class RunLogger:
         summary = report.get("summary", "N/A")
 
         # Choose style based on status with Russian labels
-        if status == "done":
-            icon = "✅"
-            title = t("report_task_completed")
-            border_style = "green"
-        elif status == "failed":
-            icon = "❌"
-            title = t("report_task_failed")
-            border_style = "red"
-        elif status == "need_user_input":
-            icon = "⏸️"
-            title = t("report_waiting_user")
-            border_style = "yellow"
-        else:
-            icon = "ℹ️"
-            title = t("report_execution_finished")
-            border_style = "blue"
+        icon, title_key, border_style = _REPORT_STYLES.get(status, _DEFAULT_REPORT_STYLE)
+        title = t(title_key)
 
         console.print()
         console.print(
@@ -160,108 +463,55 @@ class RunLogger:
         )
 
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "type": "final_report",
             "report": report,
         }
-        self._log_handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        self._log_handle.flush()
-
-    def _summarize_result(self, result: Any, max_len: int = 100) -> str:
-        """Create a compact summary of a result in Russian."""
-        if result is None:
-            return "null"
-        if isinstance(result, bool):
-            return "✓" if result else "✗"
-        if isinstance(result, (int, float)):
-            return str(result)
-        if isinstance(result, str):
-            if len(result) > max_len:
-                return result[:max_len] + "..."
-            return result
-        if isinstance(result, dict):
-            # Handle common result patterns with Russian
-            if "success" in result:
-                if result.get("success"):
-                    if "url" in result:
-                        return f"✓ → {result['url']}"
-                    if "typed" in result:
-                        return t("result_typed", text=result["typed"])
-                    if "clicked" in result:
-                        return f"✓ {t('result_clicked')}"
-                    if "pressed" in result:
-                        return t("result_pressed", keys=result["pressed"])
-                    if "scrolled" in result:
-                        return t("result_scrolled", direction=result["scrolled"])
-                    return f"✓ {t('result_success')}"
-                else:
-                    return f"✗ {result.get('error', t('result_failed'))[:50]}"
-
-            if "error" in result:
-                error = result["error"]
-                if "Timeout" in error:
-                    return f"✗ {t('result_timeout')}"
-                return f"✗ {error[:50]}"
-
-            if "candidates" in result:
-                count = len(result["candidates"])
-                if count > 0:
-                    first = result["candidates"][0]
-                    text = first.get("text", "")[:30] or first.get("selector", "")[:30]
-                    return f"{t('result_found_elements', count=count)} ('{text}'...)"
-                return t("result_no_elements")
-
-            if "elements" in result:
-                return t("result_found_elements", count=len(result["elements"]))
-
-            return json.dumps(result, ensure_ascii=False)[:max_len]
-        if isinstance(result, list):
-            return f"[{len(result)} элементов]"
-        return str(result)[:max_len]
+        self._writer.write(_dumps(entry, _ORJSON_LINE_OPTS))
+
+    def _summarize_result(
+        self,
+        result: Any,
+        max_len: int = 100,
+        result_json: bytes | None = None,
+    ) -> str:
+        """
+        Create a compact summary of a result in Russian.
+
+        result_json, when given, is the already-serialized result and is
+        reused instead of serializing dicts a second time.
+        """
+        summarize = _SUMMARIZERS.get(type(result), _summarize_other)
+        return summarize(result, max_len, result_json)
 
     def _print_tool_call(self, tool: str, args: dict[str, Any], result: str, success: bool) -> None:
         """Print tool call in clean format with Russian descriptions."""
         # Format args nicely
-        args_parts = []
-        for key, value in args.items():
-            if isinstance(value, str):
-                # Truncate long strings
-                if len(value) > 40:
-                    value = value[:37] + "..."
-                args_parts.append(f'{key}="{value}"')
-            else:
-                args_parts.append(f"{key}={value}")
-        args_str = ", ".join(args_parts)
-
-        # Choose icon and Russian description based on tool type
-        tool_info = {
-            "navigate_to_url": ("🌐", "tool_navigating"),
-            "click": ("👆", "tool_clicking"),
-            "type_text": ("⌨️", "tool_typing"),
-            "press": ("⏎", "tool_pressing"),
-            "scroll": ("📜", "tool_scrolling"),
-            "query_dom": ("🔍", "tool_searching_dom"),
-            "get_all_elements": ("📋", None),
-            "wait": ("⏳", "tool_waiting"),
-            "hover": ("👆", "tool_hovering"),
-            "back": ("⬅️", "tool_going_back"),
-            "take_screenshot": ("📸", "tool_screenshot"),
-            "close_popups": ("❌", "tool_closing_popups"),
-            "get_current_url": ("🔗", "tool_getting_url"),
-        }
-        icon, desc_key = tool_info.get(tool, ("🔧", None))
+        args_str = _format_args(args)
 
-        # Status indicator
-        status = "[green]✓[/green]" if success else "[red]✗[/red]"
+        if _PLAIN_TOOL_LINES:
+            icon, _ = _TOOL_INFO.get(tool, _DEFAULT_TOOL_INFO)
+            mark = "✓" if success else "✗"
+            console.file.write(f"  {icon} {tool}({args_str}) {mark} {result}\n")
+            return
+
+        # Start from the prebuilt icon + tool prefix
+        prefix = _TOOL_PREFIX.get(tool)
+        if prefix is None:
+            line = Text.assemble(f"  {_DEFAULT_TOOL_INFO[0]} ", (tool, "blue"), "(")
+        else:
+            line = prefix.copy()
+
+        # Append arguments, status indicator and result
+        line.append(f"{args_str}) ")
+        line.append_text(_STATUS_TEXT[success])
+        line.append(f" {result}")
 
-        # Print formatted line
-        console.print(f"  {icon} [blue]{tool}[/blue]({args_str}) {status} {result}")
+        console.print(line)
 
 
 def create_run_logger() -> RunLogger:
     """Create a new run logger with timestamped directory."""
-    from src.app.config import config
-
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = config.OUTPUT_RUNS_DIR / timestamp
     return RunLogger(run_dir)
@@ -291,11 +541,41 @@ def print_task_start(task: str) -> None:
     )
 
 
-def get_user_confirmation(prompt: str) -> bool:
+async def ainput(prompt: str = "") -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+
+    The read runs in a daemon thread rather than the default executor, so an
+    interrupted prompt can't keep the process alive at shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def resolve(line: str | None, error: BaseException | None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line or "")
+
+    def read() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as e:  # EOFError, closed stdin
+            loop.call_soon_threadsafe(resolve, None, e)
+        else:
+            loop.call_soon_threadsafe(resolve, line, None)
+
+    threading.Thread(target=read, name="stdin-reader", daemon=True).start()
+    return await future
+
+
+async def get_user_confirmation(prompt: str) -> bool:
     """Get yes/no confirmation from user in Russian."""
     console.print(f"\n[bold yellow]{prompt}[/bold yellow]")
     while True:
-        response = input(t("confirm_yes_no")).strip().lower()
+        response = (await ainput(t("confirm_yes_no"))).strip().lower()
         if response in ("yes", "y", "да", "д"):
             return True
         if response in ("no", "n", "нет", "н"):
@@ -303,7 +583,7 @@ def get_user_confirmation(prompt: str) -> bool:
         console.print(f"[dim]{t('confirm_enter_yes_no')}[/dim]")
 
 
-def get_user_input(prompt: str) -> str:
+async def get_user_input(prompt: str) -> str:
     """Get text input from user."""
     console.print(f"\n[bold cyan]{prompt}[/bold cyan]")
-    return input("> ").strip()
+    return (await ainput("> ")).strip()
@@ -1,6 +1,7 @@
 """Browser controller using Playwright with persistent context."""
 
 import asyncio
+import os
 from pathlib import Path
 from typing import Any, Optional
 
@@ -14,15 +15,386 @@ from playwright.async_api import (
 
 from src.app.config import config
 
+# Set DEBUG_SELECTORS=1 in environment to print element query diagnostics
+_DEBUG_SELECTORS = os.environ.get("DEBUG_SELECTORS", "0") == "1"
+
+# Visible text of the page: text nodes outside hidden, script and style
+# elements, joined with single spaces
+_VISIBLE_TEXT_JS = r"""
+    () => {
+        // Resolve hidden elements up front in one batch of style reads,
+        // so the walk below does no layout work per text node
+        const hidden = new Set(document.querySelectorAll('script,style,noscript'));
+        for (const el of document.body.querySelectorAll('*')) {
+            const style = window.getComputedStyle(el);
+            if (style.display === 'none' || style.visibility === 'hidden') {
+                hidden.add(el);
+            }
+        }
+
+        // Visibility per parent element, shared by its text nodes
+        const parentVisible = new Map();
+        const isVisible = (parent) => {
+            let visible = parentVisible.get(parent);
+            if (visible === undefined) {
+                visible = true;
+                for (let p = parent; p; p = p.parentElement) {
+                    if (hidden.has(p)) { visible = false; break; }
+                }
+                parentVisible.set(parent, visible);
+            }
+            return visible;
+        };
+
+        const walker = document.createTreeWalker(
+            document.body,
+            NodeFilter.SHOW_TEXT,
+            null
+        );
+
+        const texts = [];
+        let node;
+        while (node = walker.nextNode()) {
+            const parent = node.parentElement;
+            if (!parent || !isVisible(parent)) continue;
+            const text = node.textContent.trim();
+            if (text) texts.push(text);
+        }
+        // Collapse runs of whitespace inside text nodes as well, so
+        // the result needs no further normalization
+        return texts.join(' ').replace(/\s+/g, ' ');
+    }
+"""
+
+# Everything an observation reads from the page, in one evaluation
+_OBSERVE_SNAPSHOT_JS = """
+    () => ({
+        title: document.title,
+        text: window.__agent.visibleText(),
+        hasInputFocused: Boolean(
+            document.activeElement &&
+            ['INPUT', 'TEXTAREA', 'SELECT'].includes(document.activeElement.tagName)
+        ),
+        scroll: {
+            x: window.scrollX,
+            y: window.scrollY,
+            width: document.body.scrollWidth,
+            height: document.body.scrollHeight,
+            viewportHeight: window.innerHeight,
+        },
+    })
+"""
+
+# Interactive elements scored against a batch of (query, limit) pairs
+_QUERY_ELEMENTS_JS = r"""
+    (args) => {
+        const { debug } = args;
+        const queries = args.queries.map(([query, limit]) => ({
+            queryLower: query.toLowerCase(),
+            limit: limit,
+            scored: [],
+        }));
+
+
+        // Plain tags are read from the tag index, which is cheaper
+        // than matching them as selectors
+        const interactiveTags = [
+            'a',  // only with href
+            'button',
+            'input',
+            'textarea',
+            'select',
+            'article',
+        ];
+
+        // Attribute selectors for other interactive elements
+        const interactiveSelectors = [
+            '[role="button"]',
+            '[role="link"]',
+            '[role="menuitem"]',
+            '[role="tab"]',
+            '[role="checkbox"]',
+            '[role="radio"]',
+            '[onclick]',
+            '[tabindex]:not([tabindex="-1"])',
+            '[data-product]',
+            '[data-item]',
+        ];
+
+        // Product cards - common patterns. Substring matches scan every
+        // class attribute, so they are only used when searching
+        const productCardSelectors = [
+            '[class*="product"]',
+            '[class*="Product"]',
+            '[class*="card"]',
+            '[class*="Card"]',
+            '[class*="item"]',
+            '[class*="Item"]',
+        ];
+
+        const seen = new Set();
+        for (const tag of interactiveTags) {
+            for (const el of document.getElementsByTagName(tag)) {
+                if (tag !== 'a' || el.hasAttribute('href')) seen.add(el);
+            }
+        }
+        for (const el of document.querySelectorAll(interactiveSelectors.join(','))) {
+            seen.add(el);
+        }
+        if (queries.some(q => q.queryLower)) {
+            for (const el of document.querySelectorAll(productCardSelectors.join(','))) {
+                seen.add(el);
+            }
+        }
+        const allElements = Array.from(seen);
+
+        // Diagnostics are only gathered when requested, since they
+        // take an extra pass over the matched elements
+        const debugInfo = debug ? {
+            totalElements: allElements.length,
+            queries: [],
+        } : null;
+
+        // Debug: find elements with query text
+        if (debug) {
+            for (const { queryLower } of queries) {
+                const info = { query: queryLower, textMatches: [] };
+                debugInfo.queries.push(info);
+                if (!queryLower) continue;
+                let matchCount = 0;
+                for (const el of allElements) {
+                    const text = (el.textContent || '').toLowerCase();
+                    if (text.includes(queryLower)) {
+                        matchCount++;
+                        if (info.textMatches.length < 5) {
+                            info.textMatches.push({
+                                tag: el.tagName,
+                                text: text.slice(0, 50),
+                                hasQuery: text.includes(queryLower),
+                            });
+                        }
+                    }
+                }
+                info.textMatchCount = matchCount;
+            }
+        }
+
+        // Attributes passed on for selector generation
+        const selectorAttrNames = [
+            'data-testid', 'data-qa', 'data-test',
+            'aria-label', 'name', 'type', 'href'
+        ];
+
+        // Build CSS path
+        const getPath = (element, maxDepth = 4) => {
+            const path = [];
+            let current = element;
+            let depth = 0;
+
+            while (current && current !== document.body && depth < maxDepth) {
+                let selector = current.tagName.toLowerCase();
+
+                // Add first class if meaningful
+                if (current.classList.length > 0) {
+                    const cls = Array.from(current.classList).find(c =>
+                        c.length > 2 && c.length < 30 &&
+                        !c.startsWith('css-') && !c.startsWith('sc-')
+                    );
+                    if (cls) selector += '.' + cls;
+                }
+
+                // Add nth-of-type if needed (count same-tag siblings
+                // in place instead of copying the children list)
+                const parent = current.parentElement;
+                if (parent) {
+                    const tag = current.tagName;
+                    let index = 1;
+                    for (let s = current.previousElementSibling; s; s = s.previousElementSibling) {
+                        if (s.tagName === tag) index++;
+                    }
+                    let shared = index > 1;
+                    let s = current.nextElementSibling;
+                    while (s && !shared) {
+                        shared = s.tagName === tag;
+                        s = s.nextElementSibling;
+                    }
+                    if (shared) {
+                        selector += `:nth-of-type(${index})`;
+                    }
+                }
+
+                path.unshift(selector);
+                current = parent;
+                depth++;
+            }
+
+            return path.join(' > ');
+        };
+
+        // Read all boxes first (one layout pass), so computed styles
+        // are only resolved for elements that actually have a size
+        const sized = [];
+        for (const el of allElements) {
+            const rect = el.getBoundingClientRect();
+            if (rect.width !== 0 && rect.height !== 0) sized.push([el, rect]);
+        }
+
+        for (const [el, rect] of sized) {
+            // Check visibility
+            const style = window.getComputedStyle(el);
+            if (style.display === 'none' || style.visibility === 'hidden') continue;
+            if (parseFloat(style.opacity) < 0.1) continue;
+
+            // Collect text content (textContent, unlike innerText, does
+            // not force a layout; visibility was checked above)
+            const elementText = (el.textContent || '')
+                .replace(/\s+/g, ' ').trim().slice(0, 200);
+
+            // Read the (usually short) attribute list once instead of
+            // looking up each attribute by name
+            const attrs = Object.create(null);
+            for (const attr of el.attributes) attrs[attr.name] = attr.value;
+            const ariaLabel = attrs['aria-label'] || '';
+            const placeholder = attrs['placeholder'] || '';
+            const title = attrs['title'] || '';
+            const name = attrs['name'] || '';
+            const value = el.value || '';
+            const alt = attrs['alt'] || '';
+
+            // Combine searchable text, lowercasing the text and label
+            // once for both the search and the exact-match boost
+            const textLower = elementText.toLowerCase();
+            const ariaLower = ariaLabel.toLowerCase();
+            const searchText = textLower + ' ' + ariaLower + ' ' + [
+                placeholder, title, name, value, alt
+            ].join(' ').toLowerCase();
+
+            // Element details are shared by every query that matches it
+            let candidate = null;
+
+            for (const q of queries) {
+                const queryLower = q.queryLower;
+
+                // Score match
+                let score = 0;
+                if (queryLower) {
+                    if (searchText.includes(queryLower)) {
+                        score = 1;
+                        // Boost exact matches
+                        if (textLower === queryLower || ariaLower === queryLower) {
+                            score = 2;
+                        }
+                    }
+                } else {
+                    score = 1; // No query = return all
+                }
+
+                if (score === 0 && queryLower) continue;
+
+                if (candidate === null) {
+                    // Get role
+                    let role = attrs['role'] || el.tagName.toLowerCase();
+                    if (el.tagName === 'INPUT') {
+                        role = `input[${el.type || 'text'}]`;
+                    }
+
+                    // Collect attributes for selector generation
+                    const attributes = {};
+                    for (const attr of selectorAttrNames) {
+                        const val = attrs[attr];
+                        if (val) attributes[attr] = val;
+                    }
+
+                    candidate = {
+                        tag: el.tagName.toLowerCase(),
+                        role: role,
+                        text: elementText.slice(0, 100),
+                        ariaLabel: ariaLabel,
+                        placeholder: placeholder,
+                        name: name,
+                        id: el.id || '',
+                        attributes: attributes,
+                        bbox: {
+                            x: Math.round(rect.x),
+                            y: Math.round(rect.y),
+                            width: Math.round(rect.width),
+                            height: Math.round(rect.height),
+                        },
+                        inViewport: (
+                            rect.top >= 0 &&
+                            rect.left >= 0 &&
+                            rect.bottom <= window.innerHeight &&
+                            rect.right <= window.innerWidth
+                        ),
+                    };
+                }
+
+                // Rank as one number: score (descending), then in-viewport
+                // first, then top to bottom (|y| stays well below 1e6)
+                const rank = -score * 1e7 - (candidate.inViewport ? 1e6 : 0) + candidate.bbox.y;
+                q.scored.push([rank, score, candidate, el]);
+            }
+        }
+
+        // Sort by the precomputed rank
+        const byRank = (a, b) => a[0] - b[0];
+
+        // CSS paths are only built for the candidates that are returned
+        return {
+            results: queries.map(q => q.scored
+                .sort(byRank)
+                .slice(0, q.limit)
+                .map(([, score, c, el]) => {
+                    if (c.cssPath === undefined) c.cssPath = getPath(el);
+                    return { ...c, score: score };
+                })),
+            debug: debugInfo,
+        };
+    }
+"""
+
+# The page helpers above, installed once per document as window.__agent
+# so each call ships a short stub instead of the whole script
+_PAGE_HELPERS_JS = (
+    "window.__agent = {"
+    f"visibleText: {_VISIBLE_TEXT_JS.strip()}, "
+    f"snapshot: {_OBSERVE_SNAPSHOT_JS.strip()}, "
+    f"queryElements: {_QUERY_ELEMENTS_JS.strip()}"
+    "};"
+)
+
+# Call a page helper by name; null means the helpers are not installed yet
+_CALL_PAGE_HELPER_JS = """
+    ([name, arg]) => window.__agent ? { value: window.__agent[name](arg) } : null
+"""
+
+
+def _truncate(text: str, max_length: int) -> str:
+    """Cut page text to max_length characters, marking the cut."""
+    if len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
+
 
 class BrowserController:
     """Controls browser instance with persistent session support."""
 
+    # Playwright driver shared by every started controller in the process;
+    # it is launched by the first start() and stopped by the last stop()
+    _shared_playwright: Optional[Playwright] = None
+    _playwright_users = 0
+    _playwright_lock = asyncio.Lock()
+
     def __init__(self):
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        # Element queries waiting for the next batched page evaluation
+        self._pending_queries: list[
+            tuple[str, int, asyncio.Future[list[dict[str, Any]]]]
+        ] = []
+        self._flush_task: Optional[asyncio.Task[None]] = None
 
     @property
     def page(self) -> Page:
@@ -35,7 +407,7 @@ class BrowserController:
         """Start browser with persistent context."""
         config.ensure_dirs()
 
-        self._playwright = await async_playwright().start()
+        self._playwright = await self._acquire_playwright()
 
         # Use persistent context for session persistence
         self._context = await self._playwright.chromium.launch_persistent_context(
@@ -49,6 +421,9 @@ class BrowserController:
             ],
         )
 
+        # Install the page helpers in every document the context loads
+        await self._context.add_init_script(script=_PAGE_HELPERS_JS)
+
         # Get or create a page
         pages = self._context.pages
         if pages:
@@ -64,19 +439,37 @@ class BrowserController:
         if self._context:
             await self._context.close()
         if self._playwright:
-            await self._playwright.stop()
+            await self._release_playwright()
 
         self._page = None
         self._context = None
         self._playwright = None
 
+    @classmethod
+    async def _acquire_playwright(cls) -> Playwright:
+        """Get the shared Playwright driver, starting it on first use."""
+        async with cls._playwright_lock:
+            if cls._shared_playwright is None:
+                cls._shared_playwright = await async_playwright().start()
+            cls._playwright_users += 1
+            return cls._shared_playwright
+
+    @classmethod
+    async def _release_playwright(cls) -> None:
+        """Drop one user of the shared driver, stopping it after the last."""
+        async with cls._playwright_lock:
+            cls._playwright_users -= 1
+            if cls._playwright_users == 0 and cls._shared_playwright is not None:
+                await cls._shared_playwright.stop()
+                cls._shared_playwright = None
+
     async def navigate(self, url: str) -> None:
         """Navigate to a URL."""
         await self.page.goto(url, wait_until="domcontentloaded")
         await self._wait_for_stability()
 
-    async def get_url(self) -> str:
-        """Get current URL."""
+    def get_url(self) -> str:
+        """Get current URL (tracked by Playwright, so no page round-trip)."""
         return self.page.url
 
     async def click(self, selector: str) -> None:
@@ -112,54 +505,40 @@ class BrowserController:
         await self.page.go_back()
         await self._wait_for_stability()
 
-    async def take_screenshot(self, path: Path, full_page: bool = False) -> None:
-        """Take a screenshot."""
-        await self.page.screenshot(path=str(path), full_page=full_page)
+    async def take_screenshot(
+        self,
+        path: Path,
+        full_page: bool = False,
+        quality: Optional[int] = None,
+    ) -> None:
+        """
+        Take a screenshot.
 
-    async def get_visible_text(self, max_length: int = 2000) -> str:
-        """Get visible text content from the page."""
-        text = await self.page.evaluate("""
-            () => {
-                const walker = document.createTreeWalker(
-                    document.body,
-                    NodeFilter.SHOW_TEXT,
-                    {
-                        acceptNode: (node) => {
-                            const parent = node.parentElement;
-                            if (!parent) return NodeFilter.FILTER_REJECT;
-
-                            const style = window.getComputedStyle(parent);
-                            if (style.display === 'none' || style.visibility === 'hidden') {
-                                return NodeFilter.FILTER_REJECT;
-                            }
-
-                            const tag = parent.tagName.toLowerCase();
-                            if (['script', 'style', 'noscript'].includes(tag)) {
-                                return NodeFilter.FILTER_REJECT;
-                            }
-
-                            return NodeFilter.FILTER_ACCEPT;
-                        }
-                    }
-                );
+        The image format follows the path's extension (.png or .jpg);
+        quality (0-100) applies to JPEG only.
+        """
+        await self.page.screenshot(path=str(path), full_page=full_page, quality=quality)
 
-                const texts = [];
-                let node;
-                while (node = walker.nextNode()) {
-                    const text = node.textContent.trim();
-                    if (text) texts.push(text);
-                }
-                return texts.join(' ');
-            }
-        """)
-        if len(text) > max_length:
-            text = text[:max_length] + "..."
-        return text
+    async def get_visible_text(self, max_length: int = 2000) -> str:
+        """Get visible text content from the page, with whitespace collapsed."""
+        text = await self._call_page_helper("visibleText")
+        return _truncate(text, max_length)
 
     async def get_page_title(self) -> str:
         """Get page title."""
         return await self.page.title()
 
+    async def observe_snapshot(self, max_text_length: int = 2000) -> dict[str, Any]:
+        """
+        Read title, visible text, input focus and scroll position at once.
+
+        One page evaluation replaces the four round-trips of calling
+        get_page_title, get_visible_text and the focus/scroll checks.
+        """
+        snapshot = await self._call_page_helper("snapshot")
+        snapshot["text"] = _truncate(snapshot["text"], max_text_length)
+        return snapshot
+
     async def query_interactive_elements(
         self,
         query: str = "",
@@ -170,242 +549,84 @@ class BrowserController:
 
         Returns elements matching the query with their properties and
         dynamically generated selectors.
-        """
-        # JavaScript to collect interactive elements
-        elements_data = await self.page.evaluate("""
-            (args) => {
-                const { query, limit } = args;
-                const queryLower = query.toLowerCase();
-
-
-                // Selectors for interactive elements (including product cards)
-                const interactiveSelectors = [
-                    'a[href]',
-                    'button',
-                    'input',
-                    'textarea',
-                    'select',
-                    '[role="button"]',
-                    '[role="link"]',
-                    '[role="menuitem"]',
-                    '[role="tab"]',
-                    '[role="checkbox"]',
-                    '[role="radio"]',
-                    '[onclick]',
-                    '[tabindex]:not([tabindex="-1"])',
-                    // Product cards - common patterns
-                    '[class*="product"]',
-                    '[class*="Product"]',
-                    '[class*="card"]',
-                    '[class*="Card"]',
-                    '[class*="item"]',
-                    '[class*="Item"]',
-                    '[data-product]',
-                    '[data-item]',
-                    'article',
-                ];
-
-                const allElements = document.querySelectorAll(interactiveSelectors.join(','));
-                const candidates = [];
-
-                // DEBUG: Count elements by selector type
-                const debugInfo = {
-                    totalElements: allElements.length,
-                    selectorCounts: {},
-                    textMatches: [],
-                    query: queryLower,
-                };
-                for (const sel of interactiveSelectors) {
-                    const count = document.querySelectorAll(sel).length;
-                    if (count > 0) debugInfo.selectorCounts[sel] = count;
-                }
-
-                // Debug: find elements with query text
-                if (queryLower) {
-                    let matchCount = 0;
-                    for (const el of allElements) {
-                        const text = (el.innerText || '').toLowerCase();
-                        if (text.includes(queryLower)) {
-                            matchCount++;
-                            if (debugInfo.textMatches.length < 5) {
-                                debugInfo.textMatches.push({
-                                    tag: el.tagName,
-                                    text: text.slice(0, 50),
-                                    hasQuery: text.includes(queryLower),
-                                });
-                            }
-                        }
-                    }
-                    debugInfo.textMatchCount = matchCount;
-                }
 
-                for (const el of allElements) {
-                    // Check visibility
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width === 0 || rect.height === 0) continue;
-
-                    const style = window.getComputedStyle(el);
-                    if (style.display === 'none' || style.visibility === 'hidden') continue;
-                    if (parseFloat(style.opacity) < 0.1) continue;
-
-                    // Collect text content
-                    const innerText = (el.innerText || '').trim().slice(0, 200);
-                    const ariaLabel = el.getAttribute('aria-label') || '';
-                    const placeholder = el.getAttribute('placeholder') || '';
-                    const title = el.getAttribute('title') || '';
-                    const name = el.getAttribute('name') || '';
-                    const value = el.value || '';
-                    const alt = el.getAttribute('alt') || '';
-
-                    // Combine searchable text
-                    const searchText = [
-                        innerText, ariaLabel, placeholder, title, name, value, alt
-                    ].join(' ').toLowerCase();
-
-                    // Score match
-                    let score = 0;
-                    if (queryLower) {
-                        if (searchText.includes(queryLower)) {
-                            score = 1;
-                            // Boost exact matches
-                            const textLower = innerText.toLowerCase();
-                            const ariaLower = ariaLabel.toLowerCase();
-                            if (textLower === queryLower || ariaLower === queryLower) {
-                                score = 2;
-                            }
-                        }
-                    } else {
-                        score = 1; // No query = return all
-                    }
-
-                    if (score === 0 && queryLower) continue;
-
-                    // Get role
-                    let role = el.getAttribute('role') || el.tagName.toLowerCase();
-                    if (el.tagName === 'INPUT') {
-                        role = `input[${el.type || 'text'}]`;
-                    }
-
-                    // Collect attributes for selector generation
-                    const attributes = {};
-                    const attrNames = [
-                        'data-testid', 'data-qa', 'data-test',
-                        'aria-label', 'name', 'type', 'href'
-                    ];
-                    for (const attr of attrNames) {
-                        const val = el.getAttribute(attr);
-                        if (val) attributes[attr] = val;
-                    }
-
-                    // Build CSS path
-                    const getPath = (element, maxDepth = 4) => {
-                        const path = [];
-                        let current = element;
-                        let depth = 0;
-
-                        while (current && current !== document.body && depth < maxDepth) {
-                            let selector = current.tagName.toLowerCase();
-
-                            // Add first class if meaningful
-                            if (current.classList.length > 0) {
-                                const cls = Array.from(current.classList).find(c =>
-                                    c.length > 2 && c.length < 30 &&
-                                    !c.startsWith('css-') && !c.startsWith('sc-')
-                                );
-                                if (cls) selector += '.' + cls;
-                            }
-
-                            // Add nth-of-type if needed
-                            const parent = current.parentElement;
-                            if (parent) {
-                                const siblings = Array.from(parent.children).filter(
-                                    c => c.tagName === current.tagName
-                                );
-                                if (siblings.length > 1) {
-                                    const index = siblings.indexOf(current) + 1;
-                                    selector += `:nth-of-type(${index})`;
-                                }
-                            }
-
-                            path.unshift(selector);
-                            current = parent;
-                            depth++;
-                        }
+        Calls made while a batch is being collected (within the same event
+        loop pass) share one page evaluation.
+        """
+        future: asyncio.Future[list[dict[str, Any]]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending_queries.append((query, limit, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_queries())
+        return await future
+
+    async def _flush_queries(self) -> None:
+        """Run every pending element query in one batched evaluation."""
+        # Yield once so queries issued concurrently can join this batch
+        # without adding a fixed delay to a lone query
+        await asyncio.sleep(0)
+        pending, self._pending_queries = self._pending_queries, []
+        self._flush_task = None
 
-                        return path.join(' > ');
-                    };
+        try:
+            results = await self._query_elements(
+                [(query, limit) for query, limit, _ in pending]
+            )
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), elements in zip(pending, results):
+            if not future.done():
+                future.set_result(elements)
+
+    async def _query_elements(
+        self,
+        queries: list[tuple[str, int]],
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run several (query, limit) element queries in one page evaluation.
 
-                    candidates.push({
-                        tag: el.tagName.toLowerCase(),
-                        role: role,
-                        text: innerText.slice(0, 100),
-                        ariaLabel: ariaLabel,
-                        placeholder: placeholder,
-                        name: name,
-                        id: el.id || '',
-                        attributes: attributes,
-                        bbox: {
-                            x: Math.round(rect.x),
-                            y: Math.round(rect.y),
-                            width: Math.round(rect.width),
-                            height: Math.round(rect.height),
-                        },
-                        cssPath: getPath(el),
-                        score: score,
-                        inViewport: (
-                            rect.top >= 0 &&
-                            rect.left >= 0 &&
-                            rect.bottom <= window.innerHeight &&
-                            rect.right <= window.innerWidth
-                        ),
-                    });
-                }
+        The page is walked once and every element is scored against each
+        query, so N queries cost one DOM pass instead of N.
+        """
+        data = await self._call_page_helper(
+            "queryElements", {"queries": queries, "debug": _DEBUG_SELECTORS}
+        )
 
-                // Sort by score (descending) and viewport visibility
-                candidates.sort((a, b) => {
-                    if (b.score !== a.score) return b.score - a.score;
-                    if (a.inViewport !== b.inViewport) return a.inViewport ? -1 : 1;
-                    return a.bbox.y - b.bbox.y; // Top to bottom
-                });
-
-                return {
-                    candidates: candidates.slice(0, limit),
-                    debug: debugInfo,
-                };
-            }
-        """, {"query": query, "limit": limit})
-
-        # Extract debug info if present
-        if isinstance(elements_data, dict) and "debug" in elements_data:
-            debug_info = elements_data.get("debug", {})
-            elements_data = elements_data.get("candidates", [])
-            # Print debug info
-            import os
-            if os.environ.get("DEBUG_SELECTORS", "0") == "1":
-                print(f"  [JS DEBUG] Total elements: {debug_info.get('totalElements', '?')}")
-                print(f"  [JS DEBUG] Query: '{debug_info.get('query', '')}'")
-                print(f"  [JS DEBUG] Text match count: {debug_info.get('textMatchCount', '?')}")
-                if debug_info.get('textMatches'):
+        debug_info = data["debug"]
+        if debug_info:
+            print(f"  [JS DEBUG] Total elements: {debug_info.get('totalElements', '?')}")
+            for info in debug_info.get("queries", []):
+                print(f"  [JS DEBUG] Query: '{info.get('query', '')}'")
+                print(f"  [JS DEBUG] Text match count: {info.get('textMatchCount', '?')}")
+                if info.get('textMatches'):
                     print(f"  [JS DEBUG] Sample matches:")
-                    for m in debug_info.get('textMatches', []):
+                    for m in info.get('textMatches', []):
                         print(f"    - <{m.get('tag')}> '{m.get('text')}' hasQuery={m.get('hasQuery')}")
 
         # Generate unique selectors for each element
         from src.browser.selectors import generate_unique_selector
 
-        for elem in elements_data:
-            elem["selector"] = generate_unique_selector(elem)
+        results = data["results"]
+        for elements in results:
+            for elem in elements:
+                elem["selector"] = generate_unique_selector(elem)
 
-        return elements_data
+        return results
 
     async def close_popups(self) -> bool:
         """Try to close common popups/modals. Returns True if something was closed."""
         closed = False
 
-        # Common close button patterns (searched dynamically)
-        close_candidates = await self.query_interactive_elements("close", limit=5)
-        close_candidates += await self.query_interactive_elements("dismiss", limit=3)
-        close_candidates += await self.query_interactive_elements("cancel", limit=3)
+        # Common close button patterns (searched dynamically, in one page pass)
+        close, dismiss, cancel = await self._query_elements(
+            [("close", 5), ("dismiss", 3), ("cancel", 3)]
+        )
+        close_candidates = close + dismiss + cancel
 
         for candidate in close_candidates:
             # Check if it looks like a close button
@@ -428,12 +649,27 @@ class BrowserController:
 
         return closed
 
+    async def _call_page_helper(self, name: str, arg: Any = None) -> Any:
+        """Call a window.__agent helper, installing the helpers if missing."""
+        result = await self.page.evaluate(_CALL_PAGE_HELPER_JS, [name, arg])
+        if result is None:
+            # Documents loaded before start() added the init script
+            await self.page.evaluate(f"() => {{ {_PAGE_HELPERS_JS} }}")
+            result = await self.page.evaluate(_CALL_PAGE_HELPER_JS, [name, arg])
+        return result["value"]
+
     async def _wait_for_stability(self, timeout: float = 2.0) -> None:
         """Wait for page to stabilize after navigation/action."""
+        # The pause for dynamic content runs alongside the load wait, so a
+        # slow load is not followed by a further full delay
+        await asyncio.gather(
+            self._wait_for_load(timeout),
+            asyncio.sleep(config.ACTION_DELAY),
+        )
+
+    async def _wait_for_load(self, timeout: float) -> None:
+        """Wait for DOMContentLoaded, giving up silently after timeout seconds."""
         try:
             await self.page.wait_for_load_state("domcontentloaded", timeout=timeout * 1000)
         except Exception:
             pass
-
-        # Brief pause for dynamic content
-        await asyncio.sleep(config.ACTION_DELAY)
@@ -1,5 +1,7 @@
 """Page observation utilities for context-limited observations."""
 
+import asyncio
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -8,6 +10,17 @@ from typing import Optional
 from src.app.config import config
 from src.browser.controller import BrowserController
 
+# Everything up to and including the last sentence-ending punctuation
+_THROUGH_LAST_SENTENCE = re.compile(r".*[.?!]", re.DOTALL)
+
+# Per-step screenshots are JPEG: far cheaper to encode and store than PNG
+_SCREENSHOT_QUALITY = 70
+
+
+async def _none() -> None:
+    """Placeholder for a skipped step in an asyncio.gather call."""
+    return None
+
 
 @dataclass
 class Observation:
@@ -58,75 +71,46 @@ class Observer:
         This is the main context-limiting mechanism - we don't dump
         the entire DOM, just a summary of visible content.
         """
-        page = self.browser.page
-
-        # Get basic info
-        url = await self.browser.get_url()
-        title = await self.browser.get_page_title()
-
-        # Get visible text and summarize
-        visible_text = await self.browser.get_visible_text(
-            max_length=config.MAX_OBSERVATION_LENGTH
+        url = self.browser.get_url()
+
+        # Title, text, focus and scroll come from one page evaluation; the
+        # screenshot is independent, so both are issued concurrently
+        snapshot, screenshot_path = await asyncio.gather(
+            self.browser.observe_snapshot(
+                max_text_length=config.MAX_OBSERVATION_LENGTH
+            ),
+            self._take_screenshot() if take_screenshot else _none(),
         )
-        text_summary = self._create_summary(visible_text)
-
-        # Check for focused input
-        has_input_focused = await page.evaluate("""
-            () => {
-                const active = document.activeElement;
-                return active && ['INPUT', 'TEXTAREA', 'SELECT'].includes(active.tagName);
-            }
-        """)
-
-        # Get scroll position
-        scroll_position = await page.evaluate("""
-            () => ({
-                x: window.scrollX,
-                y: window.scrollY,
-                width: document.body.scrollWidth,
-                height: document.body.scrollHeight,
-                viewportHeight: window.innerHeight,
-            })
-        """)
-
-        # Take screenshot if requested
-        screenshot_path = None
-        if take_screenshot:
-            screenshot_path = await self._take_screenshot()
+
+        text_summary = self._create_summary(snapshot["text"])
 
         return Observation(
             url=url,
-            title=title,
+            title=snapshot["title"],
             visible_text_summary=text_summary,
             screenshot_path=screenshot_path,
-            has_input_focused=has_input_focused,
-            scroll_position=scroll_position,
+            has_input_focused=snapshot["hasInputFocused"],
+            scroll_position=snapshot["scroll"],
             timestamp=datetime.now().isoformat(),
         )
 
     async def _take_screenshot(self) -> str:
         """Take a screenshot and return the path."""
         self._screenshot_counter += 1
-        filename = f"step_{self._screenshot_counter:04d}.png"
+        filename = f"step_{self._screenshot_counter:04d}.jpg"
         path = self.screenshots_dir / filename
-        await self.browser.take_screenshot(path)
+        await self.browser.take_screenshot(path, quality=_SCREENSHOT_QUALITY)
         return str(path)
 
     def _create_summary(self, text: str, max_length: int = 500) -> str:
-        """Create a brief summary of page text."""
-        # Clean up and truncate
-        text = " ".join(text.split())  # Normalize whitespace
-
+        """Create a brief summary of page text (already whitespace-normalized)."""
         if len(text) <= max_length:
             return text
 
         # Try to end at sentence boundary
         truncated = text[:max_length]
-        last_period = truncated.rfind(".")
-        last_question = truncated.rfind("?")
-        last_exclaim = truncated.rfind("!")
-
-        best_end = max(last_period, last_question, last_exclaim)
+        match = _THROUGH_LAST_SENTENCE.match(truncated)
+        best_end = match.end() - 1 if match else -1
 
         if best_end > max_length * 0.5:
             return truncated[: best_end + 1]
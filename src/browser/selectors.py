@@ -1,7 +1,24 @@
 """Dynamic selector generation without hardcoded selectors."""
 
+import re
+from functools import lru_cache
 from typing import Any
 
+# Characters that need escaping (or replacing) inside a quoted CSS value
+_CSS_ESCAPE_RE = re.compile(r'[\\"\n]')
+_CSS_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": " "})
+
+# Common patterns for auto-generated IDs (matched anywhere in the ID):
+# framework prefixes, then generic prefixes
+_AUTO_ID_RE = re.compile(r"react-|ember|vue-|:r|:R|uid-|id-|el-")
+
+# Common utility class prefixes: CSS-in-JS, styled-components, emotion,
+# styled-jsx, svelte, and BEM modifiers (often less stable)
+_UTILITY_CLASS_RE = re.compile(r"css-|sc-|emotion-|jsx-|svelte-|__")
+
+# Attributes tried first for a selector, in priority order
+_STABLE_ATTRS = ("data-testid", "data-qa", "data-test", "aria-label", "name")
+
 
 def generate_unique_selector(element_info: dict[str, Any]) -> str:
     """
@@ -17,16 +34,14 @@ def generate_unique_selector(element_info: dict[str, Any]) -> str:
     IMPORTANT: No hardcoded selectors - everything is computed from element properties.
     NEVER returns empty string - always returns something usable.
     """
-    # Try stable attributes first
-    stable_attrs = ["data-testid", "data-qa", "data-test", "aria-label", "name"]
+    attributes = element_info.get("attributes") or {}
 
-    for attr in stable_attrs:
-        if attr in element_info.get("attributes", {}):
-            value = element_info["attributes"][attr]
-            if value and value.strip():
-                # Escape special characters in attribute value
-                escaped_value = _escape_css_value(value.strip())
-                return f'[{attr}="{escaped_value}"]'
+    # Try stable attributes first
+    for attr in _STABLE_ATTRS:
+        value = attributes.get(attr)
+        if value and (value := value.strip()):
+            # Escape special characters in attribute value
+            return f'[{attr}="{_escape_css_value(value)}"]'
 
     # Try id if it looks stable (not auto-generated)
     elem_id = element_info.get("id", "")
@@ -35,48 +50,43 @@ def generate_unique_selector(element_info: dict[str, Any]) -> str:
 
     # Try ariaLabel directly (not nested in attributes)
     aria_label = element_info.get("ariaLabel", "")
-    if aria_label and aria_label.strip():
-        escaped_label = _escape_css_value(aria_label.strip()[:50])
-        return f'[aria-label="{escaped_label}"]'
+    if aria_label and (aria_label := aria_label.strip()):
+        return f'[aria-label="{_escape_css_value(aria_label[:50])}"]'
 
-    # Try role + accessible name combination
+    # Try role + accessible name combination (a non-blank ariaLabel has
+    # already returned above, so only accessible_name can apply here)
     role = element_info.get("role", "")
     name = element_info.get("ariaLabel", "") or element_info.get("accessible_name", "")
-    if role and name and name.strip():
-        escaped_name = _escape_css_value(name.strip()[:50])
-        return f'[role="{role}"][aria-label="{escaped_name}"]'
+    if role and name and (name := name.strip()):
+        return f'[role="{role}"][aria-label="{_escape_css_value(name[:50])}"]'
 
     # Try placeholder for inputs
     placeholder = element_info.get("placeholder", "")
-    if placeholder and placeholder.strip():
-        escaped_ph = _escape_css_value(placeholder.strip()[:50])
-        return f'[placeholder="{escaped_ph}"]'
+    if placeholder and (placeholder := placeholder.strip()):
+        return f'[placeholder="{_escape_css_value(placeholder[:50])}"]'
 
     # Build CSS path from ancestors (cssPath from JS, camelCase)
     css_path = element_info.get("cssPath", "") or element_info.get("css_path", "")
-    if css_path and css_path.strip():
-        return css_path.strip()
+    if css_path and (css_path := css_path.strip()):
+        return css_path
 
     # Fallback: tag + text content selector (using Playwright :has-text)
     tag = element_info.get("tag", "").lower()
     text = element_info.get("text", "")
 
-    if tag and text and text.strip():
-        # Clean and limit text
-        clean_text = text.strip()[:40]
-        if clean_text:
-            escaped_text = _escape_css_value(clean_text)
-            return f'{tag}:has-text("{escaped_text}")'
+    if tag and text and (text := text.strip()):
+        # Limit text
+        return f'{tag}:has-text("{_escape_css_value(text[:40])}")'
 
     # Try just the tag with type for inputs
     if tag == "input":
-        input_type = element_info.get("attributes", {}).get("type", "text")
+        input_type = attributes.get("type", "text")
         return f'input[type="{input_type}"]'
 
     # Try name attribute if present
     name_attr = element_info.get("name", "")
-    if name_attr and name_attr.strip():
-        return f'[name="{_escape_css_value(name_attr.strip())}"]'
+    if name_attr and (name_attr := name_attr.strip()):
+        return f'[name="{_escape_css_value(name_attr)}"]'
 
     # If we have tag, return it
     if tag:
@@ -106,32 +116,30 @@ def build_css_path(ancestors: list[dict[str, Any]], max_depth: int = 4) -> str:
         return ""
 
     # Take last N ancestors (closest to element)
-    path_parts = []
+    return " > ".join(_css_part(ancestor) for ancestor in ancestors[-max_depth:])
 
-    for ancestor in ancestors[-max_depth:]:
-        tag = ancestor.get("tag", "div").lower()
-        classes = ancestor.get("classes", [])
-        nth = ancestor.get("nth_of_type", 1)
 
-        part = tag
+def _css_part(ancestor: dict[str, Any]) -> str:
+    """Build one CSS path step: tag, first meaningful class, nth-of-type."""
+    part = ancestor.get("tag", "div").lower()
 
-        # Add first meaningful class if exists
-        if classes:
-            # Filter out utility/generated classes
-            meaningful_classes = [
-                c for c in classes
-                if not _is_utility_class(c) and len(c) < 30
-            ]
-            if meaningful_classes:
-                part += f".{meaningful_classes[0]}"
+    # Add first meaningful class if exists (skipping utility/generated classes)
+    first_class = next(
+        (
+            c for c in ancestor.get("classes", [])
+            if not _is_utility_class(c) and len(c) < 30
+        ),
+        None,
+    )
+    if first_class:
+        part += f".{first_class}"
 
-        # Add nth-of-type for disambiguation
-        if nth > 1:
-            part += f":nth-of-type({nth})"
+    # Add nth-of-type for disambiguation
+    nth = ancestor.get("nth_of_type", 1)
+    if nth > 1:
+        part += f":nth-of-type({nth})"
 
-        path_parts.append(part)
-
-    return " > ".join(path_parts)
+    return part
 
 
 def build_xpath(ancestors: list[dict[str, Any]], max_depth: int = 4) -> str:
@@ -143,29 +151,23 @@ def build_xpath(ancestors: list[dict[str, Any]], max_depth: int = 4) -> str:
     if not ancestors:
         return ""
 
-    path_parts = []
-
-    for ancestor in ancestors[-max_depth:]:
-        tag = ancestor.get("tag", "div").lower()
-        nth = ancestor.get("nth_of_type", 1)
-
-        if nth > 1:
-            part = f"{tag}[{nth}]"
-        else:
-            part = tag
+    return "//" + "/".join(_xpath_part(ancestor) for ancestor in ancestors[-max_depth:])
 
-        path_parts.append(part)
 
-    return "//" + "/".join(path_parts)
+def _xpath_part(ancestor: dict[str, Any]) -> str:
+    """Build one XPath step: tag, with a position when it is not the first."""
+    tag = ancestor.get("tag", "div").lower()
+    nth = ancestor.get("nth_of_type", 1)
+    return f"{tag}[{nth}]" if nth > 1 else tag
 
 
 def _escape_css_value(value: str) -> str:
     """Escape special characters in CSS attribute value."""
-    # Escape quotes and backslashes
-    value = value.replace("\\", "\\\\")
-    value = value.replace('"', '\\"')
-    value = value.replace("\n", " ")
-    return value
+    # Most labels need no escaping, so avoid building a copy for them
+    if not _CSS_ESCAPE_RE.search(value):
+        return value
+    # Escape quotes and backslashes (one pass, no double escaping)
+    return value.translate(_CSS_ESCAPE_TABLE)
 
 
 def _escape_css_id(id_value: str) -> str:
@@ -176,25 +178,19 @@ def _escape_css_id(id_value: str) -> str:
     return id_value.replace(":", "\\:")
 
 
+@lru_cache(maxsize=4096)
 def _is_stable_id(id_value: str) -> bool:
     """Check if an ID looks stable (not auto-generated)."""
     # Skip IDs that look auto-generated
     if not id_value:
         return False
 
-    # Common patterns for auto-generated IDs
-    auto_patterns = [
-        "react-", "ember", "vue-", ":r", ":R",  # Framework prefixes
-        "uid-", "id-", "el-",  # Generic prefixes
-    ]
-
-    for pattern in auto_patterns:
-        if pattern in id_value:
-            return False
+    if _AUTO_ID_RE.search(id_value):
+        return False
 
     # Skip IDs that are mostly numbers/hex
-    alphanumeric = sum(1 for c in id_value if c.isalnum())
-    numeric = sum(1 for c in id_value if c.isdigit())
+    alphanumeric = sum(map(str.isalnum, id_value))
+    numeric = sum(map(str.isdigit, id_value))
 
     if alphanumeric > 0 and numeric / alphanumeric > 0.5:
         return False
@@ -202,28 +198,18 @@ def _is_stable_id(id_value: str) -> bool:
     return True
 
 
+@lru_cache(maxsize=4096)
 def _is_utility_class(class_name: str) -> bool:
     """Check if a class looks like a utility/generated class."""
-    # Common utility class patterns
-    utility_patterns = [
-        "css-",  # CSS-in-JS
-        "sc-",  # styled-components
-        "emotion-",
-        "jsx-",
-        "svelte-",
-        "__",  # BEM modifiers often less stable
-    ]
-
-    for pattern in utility_patterns:
-        if class_name.startswith(pattern):
-            return True
+    if _UTILITY_CLASS_RE.match(class_name):
+        return True
 
     # Very short or very long classes are often utilities
     if len(class_name) < 2 or len(class_name) > 40:
         return True
 
     # Classes with lots of numbers
-    if sum(1 for c in class_name if c.isdigit()) > len(class_name) / 2:
+    if sum(map(str.isdigit, class_name)) > len(class_name) / 2:
         return True
 
     return False
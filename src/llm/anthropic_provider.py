@@ -1,12 +1,34 @@
 """Anthropic Claude LLM provider."""
 
-import json
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 
 import anthropic
 
 from src.app.config import config
-from src.llm.base import LLMProvider, LLMResponse, ToolCall
+from src.llm.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCall,
+    compact_tool_results,
+    to_json,
+)
+
+
+@lru_cache(maxsize=8)
+def _system_blocks(system_prompt: str) -> list[dict[str, Any]]:
+    """
+    Build the system prompt as a cacheable content block.
+
+    The system prompt is identical on every step, so marking it for prompt
+    caching lets the API reuse the processed prefix instead of re-reading it.
+    """
+    return [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
 
 
 class AnthropicProvider(LLMProvider):
@@ -15,11 +37,15 @@ class AnthropicProvider(LLMProvider):
     def __init__(self):
         self.client = anthropic.AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY)
         self.model = config.ANTHROPIC_MODEL
+        # Last tool list seen and its converted form; the registry returns
+        # the same tuple until a new tool is registered
+        self._tools_source: Sequence[dict[str, Any]] | None = None
+        self._tools_converted: list[dict[str, Any]] = []
 
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]],
+        tools: Sequence[dict[str, Any]],
         system_prompt: str,
     ) -> LLMResponse:
         """Send chat request to Claude."""
@@ -30,26 +56,23 @@ class AnthropicProvider(LLMProvider):
         response = await self.client.messages.create(
             model=self.model,
             max_tokens=4096,
-            system=system_prompt,
-            messages=messages,
+            system=_system_blocks(system_prompt),
+            # Older DOM/tool payloads are shortened so the request stays small
+            messages=compact_tool_results(messages),
             tools=anthropic_tools,
         )
 
-        # Parse response
-        content = None
-        tool_calls = []
+        # Parse response (the last text block wins, as before)
+        content: str | None = None
+        tool_calls: list[ToolCall] = []
+        add_tool_call = tool_calls.append
 
         for block in response.content:
-            if block.type == "text":
+            block_type = block.type
+            if block_type == "tool_use":
+                add_tool_call(ToolCall(block.id, block.name, block.input))
+            elif block_type == "text":
                 content = block.text
-            elif block.type == "tool_use":
-                tool_calls.append(
-                    ToolCall(
-                        id=block.id,
-                        name=block.name,
-                        arguments=block.input,
-                    )
-                )
 
         return LLMResponse(
             content=content,
@@ -68,7 +91,7 @@ class AnthropicProvider(LLMProvider):
         is_error: bool = False,
     ) -> dict[str, Any]:
         """Format tool result for Anthropic conversation."""
-        content = json.dumps(result, ensure_ascii=False) if not isinstance(result, str) else result
+        content = result if isinstance(result, str) else to_json(result)
 
         return {
             "type": "tool_result",
@@ -83,18 +106,18 @@ class AnthropicProvider(LLMProvider):
         tool_calls: list[ToolCall],
     ) -> dict[str, Any]:
         """Format assistant message for Anthropic."""
-        message_content: list[dict[str, Any]] = []
-
-        if content:
-            message_content.append({"type": "text", "text": content})
-
-        for tc in tool_calls:
-            message_content.append({
+        message_content: list[dict[str, Any]] = (
+            [{"type": "text", "text": content}] if content else []
+        )
+        message_content.extend(
+            {
                 "type": "tool_use",
                 "id": tc.id,
                 "name": tc.name,
                 "input": tc.arguments,
-            })
+            }
+            for tc in tool_calls
+        )
 
         return {"role": "assistant", "content": message_content}
 
@@ -105,8 +128,14 @@ class AnthropicProvider(LLMProvider):
         """Format tool results for Anthropic - single user message with all results."""
         return [{"role": "user", "content": tool_results}]
 
-    def _convert_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Convert tool definitions to Anthropic format."""
+    def _convert_tools(self, tools: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Convert tool definitions to Anthropic format (cached per tool list)."""
+        if not tools:
+            # Tool-less calls (e.g. sub-agent prompts) keep the cached entry
+            return []
+        if tools is self._tools_source:
+            return self._tools_converted
+
         anthropic_tools = []
 
         for tool in tools:
@@ -116,4 +145,6 @@ class AnthropicProvider(LLMProvider):
                 "input_schema": tool["parameters"],
             })
 
+        self._tools_source = tools
+        self._tools_converted = anthropic_tools
         return anthropic_tools
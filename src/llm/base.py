@@ -1,9 +1,12 @@
 """Base LLM provider interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+import orjson
+
 
 @dataclass
 class ToolCall:
@@ -24,6 +27,65 @@ class LLMResponse:
     usage: dict[str, int]  # Token usage
 
 
+# Tool results kept verbatim in the history sent to the LLM (newest first);
+# older ones longer than the limit are replaced by a short marker
+_KEEP_TOOL_RESULTS = 3
+_OMITTED_MIN_LENGTH = 200
+_OMITTED_TOOL_RESULT = "[omitted: older tool result]"
+
+
+def compact_tool_results(
+    messages: list[dict[str, Any]],
+    keep_last: int = _KEEP_TOOL_RESULTS,
+) -> list[dict[str, Any]]:
+    """
+    Return messages with all but the last keep_last tool results shortened.
+
+    Handles both OpenAI tool messages and Anthropic tool_result blocks.
+    The input is not modified; only changed messages are copied.
+    """
+    compacted = list(messages)
+    seen = 0
+
+    for i in range(len(messages) - 1, -1, -1):
+        message = messages[i]
+        content = message.get("content")
+
+        # OpenAI: one message per tool result
+        if message.get("role") == "tool":
+            seen += 1
+            if seen > keep_last and _is_long(content):
+                compacted[i] = {**message, "content": _OMITTED_TOOL_RESULT}
+
+        # Anthropic: tool_result blocks inside a user message
+        elif message.get("role") == "user" and isinstance(content, list):
+            blocks = None
+            for j in range(len(content) - 1, -1, -1):
+                block = content[j]
+                if not isinstance(block, dict) or block.get("type") != "tool_result":
+                    continue
+                seen += 1
+                if seen > keep_last and _is_long(block.get("content")):
+                    if blocks is None:
+                        blocks = list(content)
+                    blocks[j] = {**block, "content": _OMITTED_TOOL_RESULT}
+            if blocks is not None:
+                compacted[i] = {**message, "content": blocks}
+
+    return compacted
+
+
+def _is_long(content: Any) -> bool:
+    """Whether a tool result is worth replacing with the omission marker."""
+    return isinstance(content, str) and len(content) > _OMITTED_MIN_LENGTH
+
+
+def to_json(value: Any) -> str:
+    """Serialize a tool result or arguments to a compact JSON string."""
+    # orjson writes non-ASCII as-is, like json.dumps(ensure_ascii=False)
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -31,7 +93,7 @@ class LLMProvider(ABC):
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]],
+        tools: Sequence[dict[str, Any]],
         system_prompt: str,
     ) -> LLMResponse:
         """
@@ -1,12 +1,19 @@
 """OpenAI LLM provider."""
 
-import json
+from collections.abc import Sequence
 from typing import Any
 
 import openai
+import orjson
 
 from src.app.config import config
-from src.llm.base import LLMProvider, LLMResponse, ToolCall
+from src.llm.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCall,
+    compact_tool_results,
+    to_json,
+)
 
 
 class OpenAIProvider(LLMProvider):
@@ -15,17 +22,24 @@ class OpenAIProvider(LLMProvider):
     def __init__(self):
         self.client = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
         self.model = config.OPENAI_MODEL
+        # Last tool list seen and its converted form; the registry returns
+        # the same tuple until a new tool is registered
+        self._tools_source: Sequence[dict[str, Any]] | None = None
+        self._tools_converted: list[dict[str, Any]] = []
 
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]],
+        tools: Sequence[dict[str, Any]],
         system_prompt: str,
     ) -> LLMResponse:
         """Send chat request to OpenAI."""
 
-        # Prepend system message
-        full_messages = [{"role": "system", "content": system_prompt}] + messages
+        # Older DOM/tool payloads are shortened so the request stays small;
+        # the result is already a fresh list, so prepend the system message
+        # in place rather than concatenating into another copy
+        full_messages = compact_tool_results(messages)
+        full_messages.insert(0, {"role": "system", "content": system_prompt})
 
         # Convert tools to OpenAI format
         openai_tools = self._convert_tools(tools)
@@ -45,8 +59,8 @@ class OpenAIProvider(LLMProvider):
         if message.tool_calls:
             for tc in message.tool_calls:
                 try:
-                    arguments = json.loads(tc.function.arguments)
-                except json.JSONDecodeError:
+                    arguments = orjson.loads(tc.function.arguments)
+                except orjson.JSONDecodeError:
                     arguments = {}
 
                 tool_calls.append(
@@ -74,7 +88,7 @@ class OpenAIProvider(LLMProvider):
         is_error: bool = False,
     ) -> dict[str, Any]:
         """Format tool result for OpenAI conversation."""
-        content = json.dumps(result, ensure_ascii=False) if not isinstance(result, str) else result
+        content = result if isinstance(result, str) else to_json(result)
 
         return {
             "role": "tool",
@@ -100,7 +114,7 @@ class OpenAIProvider(LLMProvider):
                     "type": "function",
                     "function": {
                         "name": tc.name,
-                        "arguments": json.dumps(tc.arguments, ensure_ascii=False),
+                        "arguments": to_json(tc.arguments),
                     },
                 }
                 for tc in tool_calls
@@ -116,8 +130,14 @@ class OpenAIProvider(LLMProvider):
         # OpenAI expects each tool result as a separate message
         return tool_results
 
-    def _convert_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Convert tool definitions to OpenAI format."""
+    def _convert_tools(self, tools: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Convert tool definitions to OpenAI format (cached per tool list)."""
+        if not tools:
+            # Tool-less calls (e.g. sub-agent prompts) keep the cached entry
+            return []
+        if tools is self._tools_source:
+            return self._tools_converted
+
         openai_tools = []
 
         for tool in tools:
@@ -130,4 +150,6 @@ class OpenAIProvider(LLMProvider):
                 },
             })
 
+        self._tools_source = tools
+        self._tools_converted = openai_tools
         return openai_tools
@@ -22,7 +22,7 @@ def register_action_tools(browser: BrowserController) -> None:
     )
     async def navigate_to_url(url: str) -> dict[str, Any]:
         await browser.navigate(url)
-        return {"success": True, "url": await browser.get_url()}
+        return {"success": True, "url": browser.get_url()}
 
     @registry.register(
         name="get_current_url",
@@ -31,7 +31,7 @@ def register_action_tools(browser: BrowserController) -> None:
         required=[],
     )
     async def get_current_url() -> dict[str, Any]:
-        return {"url": await browser.get_url()}
+        return {"url": browser.get_url()}
 
     @registry.register(
         name="click",
@@ -168,7 +168,7 @@ def register_action_tools(browser: BrowserController) -> None:
     )
     async def back() -> dict[str, Any]:
         await browser.go_back()
-        return {"success": True, "url": await browser.get_url()}
+        return {"success": True, "url": browser.get_url()}
 
     @registry.register(
         name="close_popups",
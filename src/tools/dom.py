@@ -10,9 +10,15 @@ from src.tools.registry import registry
 # Debug mode - set DEBUG_SELECTORS=1 in environment to see raw element data
 DEBUG_SELECTORS = os.environ.get("DEBUG_SELECTORS", "0") == "1"
 
+# Last-resort outputs of generate_unique_selector that cannot be acted on
+_INVALID_SELECTORS = frozenset({"", "body"})
+_INVALID_SELECTOR_PREFIXES = ("POSITION_FALLBACK",)
+
 
 def register_dom_tools(browser: BrowserController) -> None:
     """Register DOM query tools."""
+    # Config is fixed for the process, so read the default once
+    default_limit = config.QUERY_DOM_LIMIT
 
     @registry.register(
         name="query_dom",
@@ -35,70 +41,56 @@ def register_dom_tools(browser: BrowserController) -> None:
             },
             "limit": {
                 "type": "integer",
-                "description": f"Maximum number of results (default: {config.QUERY_DOM_LIMIT})",
+                "description": f"Maximum number of results (default: {default_limit})",
             },
         },
         required=["query"],
     )
     async def query_dom(query: str, limit: int | None = None) -> dict[str, Any]:
         if limit is None:
-            limit = config.QUERY_DOM_LIMIT
+            limit = default_limit
 
         elements = await browser.query_interactive_elements(query, limit=limit)
 
         # Format for LLM consumption
         candidates = []
+        seen_selectors: set[str] = set()
         for i, elem in enumerate(elements):
-            # Ensure we have a valid selector
+            # generate_unique_selector has already tried every attribute, the
+            # text and the CSS path; what remains is its unusable last resort
             selector = elem.get("selector", "")
+            if selector in _INVALID_SELECTORS or selector.startswith(_INVALID_SELECTOR_PREFIXES):
+                continue
 
-            # Multiple fallback attempts if selector is invalid
-            if not selector or selector == "body" or selector.startswith("POSITION_FALLBACK"):
-                # Generate fallback selector from available info
-                if elem.get("ariaLabel"):
-                    selector = f'[aria-label="{elem["ariaLabel"][:50]}"]'
-                elif elem.get("placeholder"):
-                    selector = f'[placeholder="{elem["placeholder"][:50]}"]'
-                elif elem.get("name"):
-                    selector = f'[name="{elem["name"][:50]}"]'
-                elif elem.get("text"):
-                    tag = elem.get("tag", "").lower() or "*"
-                    text = elem["text"][:30].replace('"', '\\"')
-                    selector = f'{tag}:has-text("{text}")'
-                elif elem.get("cssPath"):
-                    selector = elem.get("cssPath", "")
-                elif elem.get("tag"):
-                    tag = elem.get("tag", "").lower()
-                    if tag == "input":
-                        input_type = elem.get("attributes", {}).get("type", "text")
-                        selector = f'input[type="{input_type}"]'
-                    else:
-                        selector = tag
-
-            # Skip candidates without valid selector
-            if not selector or selector == "body":
+            # A repeated selector resolves to the same (first) element anyway
+            if selector in seen_selectors:
                 continue
+            seen_selectors.add(selector)
 
+            get = elem.get
             candidate = {
                 "id": i,
-                "role": elem.get("role", "unknown"),
-                "text": elem.get("text", "")[:100],
+                "role": get("role", "unknown"),
+                "text": get("text", "")[:100],
                 "selector": selector,
             }
 
             # Add useful identifying info
-            if elem.get("ariaLabel"):
-                candidate["aria_label"] = elem["ariaLabel"][:50]
-            if elem.get("placeholder"):
-                candidate["placeholder"] = elem["placeholder"][:50]
-            if elem.get("name"):
-                candidate["name"] = elem["name"][:50]
+            aria_label = get("ariaLabel")
+            if aria_label:
+                candidate["aria_label"] = aria_label[:50]
+            placeholder = get("placeholder")
+            if placeholder:
+                candidate["placeholder"] = placeholder[:50]
+            name = get("name")
+            if name:
+                candidate["name"] = name[:50]
 
             # Add position info
-            bbox = elem.get("bbox", {})
+            bbox = get("bbox")
             if bbox:
                 candidate["position"] = f"({bbox.get('x', 0)}, {bbox.get('y', 0)})"
-                candidate["in_viewport"] = elem.get("inViewport", False)
+                candidate["in_viewport"] = get("inViewport", False)
 
             candidates.append(candidate)
 
@@ -26,6 +26,8 @@ class ToolRegistry:
     def __init__(self):
         self._tools: dict[str, Callable[..., Any]] = {}
         self._definitions: dict[str, ToolDefinition] = {}
+        # Definitions handed to the LLM, rebuilt only after a registration
+        self._defs_cache: tuple[ToolDefinition, ...] | None = None
 
     def register(
         self,
@@ -47,6 +49,7 @@ class ToolRegistry:
                     "required": required or [],
                 },
             }
+            self._defs_cache = None
             return func
 
         return decorator
@@ -55,9 +58,11 @@ class ToolRegistry:
         """Get a tool function by name."""
         return self._tools.get(name)
 
-    def get_all_definitions(self) -> list[ToolDefinition]:
-        """Get all tool definitions for LLM."""
-        return list(self._definitions.values())
+    def get_all_definitions(self) -> tuple[ToolDefinition, ...]:
+        """Get all tool definitions for LLM (the same tuple until a new registration)."""
+        if self._defs_cache is None:
+            self._defs_cache = tuple(self._definitions.values())
+        return self._defs_cache
 
     def get_definition(self, name: str) -> ToolDefinition | None:
         """Get a specific tool definition."""
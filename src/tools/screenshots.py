@@ -1,5 +1,6 @@
 """Screenshot tool."""
 
+import itertools
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +11,7 @@ from src.tools.registry import registry
 def register_screenshot_tools(browser: BrowserController, screenshots_dir: Path) -> None:
     """Register screenshot tools."""
 
-    _counter = {"value": 0}
+    _counter = itertools.count(1)
 
     @registry.register(
         name="take_screenshot",
@@ -24,8 +25,7 @@ def register_screenshot_tools(browser: BrowserController, screenshots_dir: Path)
         required=[],
     )
     async def take_screenshot(full_page: bool = False) -> dict[str, Any]:
-        _counter["value"] += 1
-        filename = f"screenshot_{_counter['value']:04d}.png"
+        filename = f"screenshot_{next(_counter):04d}.png"
         path = screenshots_dir / filename
 
         await browser.take_screenshot(path, full_page=full_page)
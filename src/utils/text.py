@@ -1,13 +1,22 @@
 """Text processing utilities."""
 
 import re
+from functools import lru_cache
+
+# Script and style elements (with their content), or any other tag
+_HTML_STRIP_RE = re.compile(
+    r"<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>",
+    re.DOTALL | re.IGNORECASE,
+)
+# A run of text between sentence-ending punctuation
+_SENTENCE_RE = re.compile(r"[^.!?]+")
 
 
 def clean_text(text: str) -> str:
     """Clean text by removing extra whitespace."""
-    # Replace multiple whitespace with single space
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    # str.split() drops leading/trailing whitespace and splits on the same
+    # (Unicode) whitespace as the regex \s, without the regex engine
+    return " ".join(text.split())
 
 
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
@@ -19,25 +28,43 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
 
 def extract_visible_text(html_text: str, max_length: int = 2000) -> str:
     """Extract and clean visible text from raw text content."""
-    # Remove script/style content patterns
-    text = re.sub(r"<script[^>]*>.*?</script>", "", html_text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<style[^>]*>.*?</style>", "", text, flags=re.DOTALL | re.IGNORECASE)
-
-    # Remove HTML tags
-    text = re.sub(r"<[^>]+>", " ", text)
+    # Collect the cleaned text between script/style blocks and tags, and
+    # stop scanning once there is more than the result can hold
+    parts: list[str] = []
+    length = 0
+    pos = 0
+    for match in _HTML_STRIP_RE.finditer(html_text):
+        words = html_text[pos:match.start()].split()
+        pos = match.end()
+        if words:
+            part = " ".join(words)
+            length += len(part) + (1 if parts else 0)  # joined length so far
+            parts.append(part)
+            if length > max_length:
+                break
+    else:
+        tail = html_text[pos:].split()
+        if tail:
+            parts.append(" ".join(tail))
 
     # Clean and truncate
-    text = clean_text(text)
-    return truncate_text(text, max_length)
+    return truncate_text(" ".join(parts), max_length)
 
 
 def summarize_text(text: str, max_sentences: int = 3) -> str:
     """Create a brief summary of text (first N sentences)."""
-    sentences = re.split(r"[.!?]+", text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    return ". ".join(sentences[:max_sentences]) + "." if sentences else ""
-
-
+    # Scan lazily so long texts stop after the first max_sentences sentences
+    sentences: list[str] = []
+    if max_sentences > 0:
+        for match in _SENTENCE_RE.finditer(text):
+            if sentence := match.group().strip():
+                sentences.append(sentence)
+                if len(sentences) == max_sentences:
+                    break
+    return ". ".join(sentences) + "." if sentences else ""
+
+
+@lru_cache(maxsize=4096)
 def normalize_selector_text(text: str) -> str:
     """Normalize text for selector matching."""
     return clean_text(text.lower())
@@ -45,10 +72,28 @@ def normalize_selector_text(text: str) -> str:
 
 def score_text_match(query: str, target: str) -> float:
     """Score how well a query matches target text (0.0 to 1.0)."""
+    return score_text_batch(query, [target])[0]
+
+
+def score_text_batch(query: str, targets: list[str]) -> list[float]:
+    """
+    Score one query against many targets (each 0.0 to 1.0).
+
+    The query is normalized and split into words once for the whole batch.
+    """
     query = normalize_selector_text(query)
+    if not query:
+        return [0.0] * len(targets)
+
+    query_words = set(query.split())
+    return [_score_normalized(query, query_words, target) for target in targets]
+
+
+def _score_normalized(query: str, query_words: set[str], target: str) -> float:
+    """Score a normalized, non-empty query against one target."""
     target = normalize_selector_text(target)
 
-    if not query or not target:
+    if not target:
         return 0.0
 
     # Exact match
@@ -59,15 +104,11 @@ def score_text_match(query: str, target: str) -> float:
     if query in target:
         return 0.8
 
-    # Word overlap
-    query_words = set(query.split())
+    # Word overlap (Jaccard similarity, so extra target words count against it)
     target_words = set(target.split())
 
-    if not query_words:
-        return 0.0
-
     overlap = len(query_words & target_words)
-    return overlap / len(query_words) * 0.6
+    return overlap / len(query_words | target_words) * 0.6
 
 
 def compress_history(steps: list[dict], max_steps: int = 5) -> str:
@@ -83,13 +124,13 @@ def compress_history(steps: list[dict], max_steps: int = 5) -> str:
 
     if older:
         # Summarize older steps
-        actions = [s.get("action", "unknown") for s in older]
-        parts.append(f"Earlier: {len(older)} steps ({', '.join(set(actions))})")
-
-    # Detail recent steps
-    for i, step in enumerate(recent):
-        action = step.get("action", "unknown")
-        result = step.get("result_summary", "")
-        parts.append(f"Step {len(steps) - len(recent) + i + 1}: {action} -> {result}")
+        actions = {s.get("action", "unknown") for s in older}
+        parts.append(f"Earlier: {len(older)} steps ({', '.join(actions)})")
+
+    # Detail recent steps, numbered from where the older ones leave off
+    parts.extend(
+        f"Step {n}: {step.get('action', 'unknown')} -> {step.get('result_summary', '')}"
+        for n, step in enumerate(recent, len(steps) - len(recent) + 1)
+    )
 
     return "\n".join(parts)
@@ -2,12 +2,17 @@
 
 import asyncio
 import functools
+import random
+import time
 from typing import Any, Callable, TypeVar
 
 from src.app.config import config
 
 T = TypeVar("T")
 
+# Default upper bound for a single backoff wait, in seconds
+_MAX_BACKOFF = 30.0
+
 
 async def wait_seconds(seconds: float) -> None:
     """Wait for specified seconds."""
@@ -32,20 +37,37 @@ class RetryError(Exception):
         self.last_error = last_error
 
 
+def _backoff_wait(current_delay: float, jitter: bool) -> float:
+    """Seconds to wait before the next attempt."""
+    if jitter:
+        # Spread concurrent retries out instead of firing them in lockstep
+        return random.uniform(current_delay * 0.5, current_delay)
+    return current_delay
+
+
 async def retry_async(
     func: Callable[..., Any],
     *args: Any,
     max_retries: int | None = None,
     delay: float = 1.0,
     backoff: float = 2.0,
+    jitter: bool = True,
+    max_backoff: float = _MAX_BACKOFF,
+    total_budget: float | None = None,
     **kwargs: Any,
 ) -> Any:
-    """Retry an async function with exponential backoff."""
+    """
+    Retry an async function with exponential backoff.
+
+    With total_budget set, no retry is started whose wait would end more
+    than total_budget seconds after the first attempt began.
+    """
     if max_retries is None:
         max_retries = config.MAX_RETRIES
 
     last_error: Exception | None = None
-    current_delay = delay
+    current_delay = min(delay, max_backoff)
+    deadline = time.monotonic() + total_budget if total_budget is not None else None
 
     for attempt in range(max_retries + 1):
         try:
@@ -53,8 +75,15 @@ async def retry_async(
         except Exception as e:
             last_error = e
             if attempt < max_retries:
-                await asyncio.sleep(current_delay)
-                current_delay *= backoff
+                wait = _backoff_wait(current_delay, jitter)
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise RetryError(
+                        f"Retry budget of {total_budget}s exhausted after "
+                        f"{attempt + 1} attempts: {e}",
+                        last_error=last_error,
+                    )
+                await asyncio.sleep(wait)
+                current_delay = min(current_delay * backoff, max_backoff)
             else:
                 raise RetryError(
                     f"Failed after {max_retries + 1} attempts: {e}",
@@ -68,18 +97,27 @@ def with_retry(
     max_retries: int | None = None,
     delay: float = 1.0,
     backoff: float = 2.0,
+    jitter: bool = True,
+    max_backoff: float = _MAX_BACKOFF,
+    total_budget: float | None = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """Decorator for async retry logic."""
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        # Config is immutable, so the default can be resolved once here
+        retries = config.MAX_RETRIES if max_retries is None else max_retries
+
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             return await retry_async(
                 func,
                 *args,
-                max_retries=max_retries,
+                max_retries=retries,
                 delay=delay,
                 backoff=backoff,
+                jitter=jitter,
+                max_backoff=max_backoff,
+                total_budget=total_budget,
                 **kwargs,
             )
 